@@ -0,0 +1,92 @@
+"""
+Shared outbound HTTP clients.
+
+One pooled httpx.AsyncClient (and one sync httpx.Client) is shared by
+every outbound caller — LLMClient and the web research tools — so
+concurrent requests to the same host reuse connections and, when the
+optional "h2" package is installed, multiplex over a single HTTP/2
+connection instead of each opening their own.
+
+Per-request settings (timeout, headers, redirects) are passed on each
+call, never on the shared client.
+"""
+
+import asyncio
+import importlib.util
+from typing import Optional
+
+import httpx
+
+from .utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+# ============================================================================
+# Constants
+# ============================================================================
+
+HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=64,
+    max_connections=128,
+    keepalive_expiry=60,
+)
+# HTTP/2 needs the optional "h2" package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_async_client: Optional[httpx.AsyncClient] = None
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_client: Optional[httpx.Client] = None
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it lazily on the running loop."""
+    global _async_client, _async_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client.is_closed or _async_loop is not loop:
+        if _async_client is not None and not _async_client.is_closed:
+            _discard_stale_client(_async_client, _async_loop)
+        _async_client = httpx.AsyncClient(limits=HTTP_LIMITS, http2=HTTP2_AVAILABLE)
+        _async_loop = loop
+    return _async_client
+
+
+def _discard_stale_client(
+    client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """
+    Close a client left on another event loop. Its connections belong to
+    that loop, so the close is scheduled there; if the loop is already
+    closed, its transports are gone and the client is just dropped.
+    """
+    if loop is not None and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        logger.debug("Closing shared HTTP client from a previous event loop")
+    else:
+        logger.debug("Dropping shared HTTP client of a closed event loop")
+
+
+def get_sync_client() -> httpx.Client:
+    """Return the shared sync Client, creating it lazily."""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        _sync_client = httpx.Client(limits=HTTP_LIMITS, http2=HTTP2_AVAILABLE)
+    return _sync_client
+
+
+def close() -> None:
+    """Close the shared sync Client."""
+    global _sync_client
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+
+
+async def aclose() -> None:
+    """Close both shared clients (call once at server shutdown)."""
+    global _async_client, _async_loop
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+        _async_loop = None
+    close()
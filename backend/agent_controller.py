@@ -12,7 +12,6 @@ This enables fully autonomous goal accomplishment beyond single-plan execution.
 """
 
 import json
-import re
 from typing import Callable, List, Optional, Dict, Any
 from datetime import datetime
 from dataclasses import dataclass, field
@@ -21,6 +20,7 @@ from .models.schemas import ActionPlan, ActionStep, ActionType
 from .browser_controller import BrowserController
 from .executor import Executor
 from .llm_client import LLMClient
+from .planner import find_json_objects
 from .utils.logger import get_logger
 
 
@@ -481,12 +481,9 @@ Is the goal achieved? Answer only with 'yes' or 'no'."""
             Parsed JSON dict or None
         """
         # Try to find JSON object in text
-        json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-        matches = re.findall(json_pattern, text, re.DOTALL)
-        
-        for match in reversed(matches):  # Try from end first
+        for start, end in reversed(find_json_objects(text)):  # Try from end first
             try:
-                return json.loads(match)
+                return json.loads(text[start:end])
             except json.JSONDecodeError:
                 continue
         
@@ -49,12 +49,16 @@ class AutomationAgent:
     """
     
     # Keywords indicating automation requests
-    AUTOMATION_KEYWORDS = {
+    AUTOMATION_KEYWORDS = frozenset({
         "open", "visit", "go to", "navigate", "search", "find", "look for",
         "click", "press", "scroll", "extract", "read", "get", "fetch",
         "type", "enter", "fill", "submit", "screenshot", "capture",
         "download", "upload", "buy", "purchase", "follow", "check"
-    }
+    })
+    # All keywords as one whole-word alternation, scanned once per message
+    _KEYWORD_RE = re.compile(
+        r"\b(?:" + "|".join(map(re.escape, sorted(AUTOMATION_KEYWORDS, key=len, reverse=True))) + r")\b"
+    )
     
     def __init__(
         self,
@@ -131,10 +135,10 @@ class AutomationAgent:
         message_lower = message.lower()
         
         # Check for automation keywords
-        for keyword in self.AUTOMATION_KEYWORDS:
-            if re.search(rf'\b{keyword}\b', message_lower):
-                logger.debug(f"Found automation keyword: {keyword}")
-                return True
+        match = self._KEYWORD_RE.search(message_lower)
+        if match:
+            logger.debug(f"Found automation keyword: {match.group()}")
+            return True
         
         # Check for URL patterns
         if re.search(r'(?:https?://|www\.|\.com|\.org|\.net)', message_lower):
@@ -19,7 +19,7 @@ import asyncio
 import uuid
 import json
 import time
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from datetime import datetime
 
 from fastapi import FastAPI, HTTPException, Request
@@ -27,17 +27,27 @@ from fastapi.responses import StreamingResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
+try:
+    import orjson
+    _json_bytes = orjson.dumps
+except ImportError:
+    def _json_bytes(data) -> bytes:
+        return json.dumps(data, ensure_ascii=False).encode()
+
 # Load environment variables from .env file
 from dotenv import load_dotenv
 load_dotenv()
 
+from . import _http
 from .config import settings
 from .llm_client import LLMClient
-from .planner import Planner
+from .llm_planner import close_session as close_planner_session
+from .planner import Planner, GoalPlanner
 from .browser_controller import BrowserController
 from .executor import Executor
 from .agent_controller import AutonomousAgentController
 from .orchestrator import AgentOrchestrator
+from .validation_agent import ValidationAgent
 from .tools import registry as tool_registry
 from .tools.browser import make_browser_tools
 from .session_manager import BrowserSessionManager, get_session
@@ -113,6 +123,9 @@ class HealthResponse(BaseModel):
 # Per-session orchestrators
 orchestrators: dict = {}
 
+# Per-session locks so messages for one session are handled in arrival order
+session_locks: dict = {}
+
 
 # ============================================================================
 # FastAPI Application Setup
@@ -176,6 +189,7 @@ async def startup_event():
         logger.info("[1/5] Initializing LLM client...")
         logger.info(f"  Base URL: {settings.LLM_BASE_URL}")
         logger.info(f"  Model: {settings.LLM_MODEL}")
+        logger.info(f"  Quantization: {settings.LLM_QUANTIZATION}")
         
         llm_client = LLMClient(
             base_url=settings.LLM_BASE_URL,
@@ -210,11 +224,20 @@ async def startup_event():
         # Initialize planner
         logger.info("[3/5] Initializing planner...")
         planner = Planner(llm_client)
+        # Stateless: one goal planner / validator serves every session
+        goal_planner = GoalPlanner(llm_client)
+        validation_agent = ValidationAgent(llm_client)
         logger.info("[OK] Planner initialized")
 
         # Initialize executor
         logger.info("[4/5] Initializing executor...")
-        executor = Executor(browser_controller)
+        executor = Executor(
+            browser_controller,
+            use_context_pool=settings.BROWSER_CONTEXT_POOL
+        )
+        if settings.BROWSER_CONTEXT_POOL:
+            await browser_controller.prewarm_pool()
+            logger.info(f"  Context pool: {browser_controller.pool_stats}")
         logger.info("[OK] Executor initialized")
 
         # Initialize autonomous agent controller
@@ -231,13 +254,15 @@ async def startup_event():
         app.state.llm_client = llm_client
         app.state.browser_controller = browser_controller
         app.state.planner = planner
+        app.state.goal_planner = goal_planner
+        app.state.validation_agent = validation_agent
         app.state.executor = executor
         app.state.autonomous_controller = autonomous_controller
 
         # Register tools into the global ToolRegistry
         logger.info("[+] Registering tools into ToolRegistry...")
         for name, fn in make_browser_tools(browser_controller).items():
-            tool_registry.register(name, fn)
+            tool_registry.register(name, fn, resource="browser")
         for name, fn in make_filesystem_tools().items():
             tool_registry.register(name, fn)
         for name, fn in make_code_tools().items():
@@ -273,6 +298,16 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Shutdown error (legacy browser_controller): {e}")
 
+    try:
+        await _http.aclose()
+    except Exception as e:
+        logger.error(f"Shutdown error (HTTP clients): {e}")
+
+    try:
+        await close_planner_session()
+    except Exception as e:
+        logger.error(f"Shutdown error (LLMPlanner session): {e}")
+
     logger.info("Server shutdown complete")
 
 
@@ -297,12 +332,35 @@ def _get_or_create_orchestrator(session_id: str) -> AgentOrchestrator:
             executor=app.state.executor,
             llm_client=app.state.llm_client,
             autonomous_controller=app.state.autonomous_controller,
-            session_id=session_id
+            session_id=session_id,
+            goal_planner=app.state.goal_planner,
+            validation_agent=app.state.validation_agent,
         )
     return orchestrators[session_id]
 
 
-def _format_sse(event_type: str, content: str, is_final: bool = False) -> str:
+def _get_session_lock(session_id: str) -> asyncio.Lock:
+    """
+    Get the lock that serializes message handling for a session.
+    
+    Args:
+        session_id: Session identifier
+        
+    Returns:
+        asyncio.Lock owned by the session
+    """
+    lock = session_locks.get(session_id)
+    if lock is None:
+        lock = session_locks[session_id] = asyncio.Lock()
+    return lock
+
+
+# Encoded 'data: {"type":...,"is_final":...,"content":' prefix per
+# (event type, is_final); only the content is encoded per event
+_SSE_PREFIXES: Dict[Tuple[str, bool], bytes] = {}
+
+
+def _format_sse(event_type: str, content: str, is_final: bool = False) -> bytes:
     """
     Format message as Server-Sent Event (SSE).
     
@@ -312,14 +370,15 @@ def _format_sse(event_type: str, content: str, is_final: bool = False) -> str:
         is_final: Whether this is the final message
         
     Returns:
-        Formatted SSE string
+        Encoded SSE frame: data: {"type", "is_final", "content"} JSON
     """
-    data = {
-        "type": event_type,
-        "content": content,
-        "is_final": is_final
-    }
-    return f"data: {json.dumps(data)}\n\n"
+    prefix = _SSE_PREFIXES.get((event_type, is_final))
+    if prefix is None:
+        prefix = _SSE_PREFIXES[(event_type, is_final)] = (
+            b'data: {"type":' + _json_bytes(event_type)
+            + (b',"is_final":true,"content":' if is_final else b',"is_final":false,"content":')
+        )
+    return prefix + _json_bytes(content) + b"}\n\n"
 
 
 # ============================================================================
@@ -397,8 +456,9 @@ async def message_endpoint(request: AgentMessageRequest) -> AgentMessageResponse
         # Get or create orchestrator for session
         orchestrator = _get_or_create_orchestrator(session_id)
 
-        # Process message through orchestrator
-        reply = await orchestrator.handle_message(message)
+        # Process message through orchestrator, one message per session at a time
+        async with _get_session_lock(session_id):
+            reply = await orchestrator.handle_message(message)
 
         # Determine mode used
         mode = orchestrator.current_mode.value
@@ -546,7 +606,8 @@ async def message_stream_endpoint(request: AgentMessageRequest):
             yield _format_sse("status", "Processing your request...")
 
             # Process through orchestrator
-            reply = await orchestrator.handle_message(message)
+            async with _get_session_lock(session_id):
+                reply = await orchestrator.handle_message(message)
 
             # Send response
             yield _format_sse("response", reply, is_final=True)
@@ -610,6 +671,7 @@ async def delete_session(session_id: str):
         raise HTTPException(status_code=404, detail="Session not found")
 
     del orchestrators[session_id]
+    session_locks.pop(session_id, None)
     logger.info(f"Session deleted: {session_id}")
 
     return {"status": "Session deleted"}
@@ -624,6 +686,7 @@ if __name__ == "__main__":
 
     logger.info("Starting Trial Automation Agent API server...")
 
+    # uvicorn's default loop="auto" uses uvloop when it is installed
     uvicorn.run(
         app,
         host="0.0.0.0",
@@ -116,7 +116,7 @@ class AutonomousAgentController:
         if planner:
             self.planner = planner
         elif mode == "llm":
-            self.planner = LLMPlanner()
+            self.planner = LLMPlanner.get_shared()
         else:  # Default to deterministic
             self.planner = HybridPlanner(llm_client=llm_client)
         
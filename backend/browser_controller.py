@@ -2,8 +2,10 @@
 Browser controller using Playwright for automation.
 """
 
-from typing import Optional, List, Callable, Any
+from typing import Optional, List, Callable, Any, AsyncIterator, Dict
 from pathlib import Path
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import asyncio
 
 from playwright.async_api import (
@@ -20,6 +22,16 @@ from .utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+# ============================================================================
+# Constants
+# ============================================================================
+
+# Upper bound on pooled BrowserContexts (created lazily on demand)
+POOL_SIZE = 4
+# A pooled context is closed and replaced after this many leases
+MAX_USES_PER_CONTEXT = 50
+
+
 class BrowserController:
     """Controls browser automation using Playwright."""
     
@@ -37,13 +49,155 @@ class BrowserController:
         """
         self.headless = headless
         self.timeout_ms = timeout_ms
-        self.page: Optional[Page] = None
+        self._default_page: Optional[Page] = None
         self.context: Optional[BrowserContext] = None
         self.browser: Optional[Browser] = None
         self._playwright = None
 
+        # Pooled contexts: lease_page() routes this task's actions to its own page
+        self._scoped_page: ContextVar[Optional[Page]] = ContextVar(
+            f"browser_page_{id(self)}", default=None
+        )
+        self._ctx_pool: asyncio.Queue = asyncio.Queue()
+        self._ctx_created = 0
+        self._ctx_uses: Dict[int, int] = {}
+        # stop() bumps the generation; leases from an older one are ignored
+        self._pool_gen = 0
+        self._lease_gen: Dict[int, int] = {}
+        self._pool_stats: Dict[str, int] = {"leases": 0, "created": 0, "recycled": 0}
+
         logger.info(f"BrowserController initialized (headless={headless})")
     
+    @property
+    def page(self) -> Optional[Page]:
+        """The page actions run on: the leased page inside lease_page(), else the default page."""
+        return self._scoped_page.get() or self._default_page
+    
+    @page.setter
+    def page(self, value: Optional[Page]) -> None:
+        self._default_page = value
+    
+    @property
+    def pool_stats(self) -> Dict[str, int]:
+        """Context pool counters (read-only snapshot)."""
+        return {
+            **self._pool_stats,
+            "open": self._ctx_created,
+            "idle": self._ctx_pool.qsize(),
+        }
+    
+    @asynccontextmanager
+    async def lease_page(self) -> AsyncIterator[Page]:
+        """
+        Run a block of actions on a pooled context's page.
+        
+        Every BrowserController action awaited inside the block (in this
+        task) uses the leased page, so concurrent plans don't share one page.
+        The context is discarded instead of returned if the block raises.
+        """
+        page = await self.acquire()
+        token = self._scoped_page.set(page)
+        failed = False
+        try:
+            yield page
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._scoped_page.reset(token)
+            await self.release(page, failed=failed)
+    
+    async def acquire(self) -> Page:
+        """
+        Take a page from the context pool, creating a context if under POOL_SIZE.
+        
+        Returns:
+            Page owned by a pooled BrowserContext
+        """
+        if self.browser is None:
+            await self.start()
+        
+        while True:
+            try:
+                page = self._ctx_pool.get_nowait()
+            except asyncio.QueueEmpty:
+                if self._ctx_created < POOL_SIZE:
+                    self._ctx_created += 1
+                    try:
+                        page = await self._new_pooled_page()
+                    except Exception:
+                        self._ctx_created -= 1
+                        raise
+                else:
+                    page = await self._ctx_pool.get()
+            if not page.is_closed():
+                break
+            # Stale entry: drop it and try again
+            self._ctx_created -= 1
+            self._ctx_uses.pop(id(page.context), None)
+        
+        self._pool_stats["leases"] += 1
+        self._lease_gen[id(page)] = self._pool_gen
+        return page
+    
+    async def release(self, page: Page, failed: bool = False) -> None:
+        """
+        Return a leased page to the pool, recycling its context when worn out.
+        
+        Args:
+            page: Page returned by acquire()
+            failed: Discard the context instead of reusing it
+        """
+        if self._lease_gen.pop(id(page), self._pool_gen) != self._pool_gen:
+            # Leased before stop(); its context closed with that browser
+            return
+        
+        key = id(page.context)
+        uses = self._ctx_uses.get(key, 0) + 1
+        
+        if failed or uses >= MAX_USES_PER_CONTEXT or page.is_closed():
+            self._ctx_uses.pop(key, None)
+            self._ctx_created -= 1
+            self._pool_stats["recycled"] += 1
+            try:
+                await page.context.close()
+            except Exception as e:
+                logger.debug(f"Pooled context close error (ignored): {e}")
+            return
+        
+        self._ctx_uses[key] = uses
+        self._ctx_pool.put_nowait(page)
+    
+    async def prewarm_pool(self, count: int = POOL_SIZE) -> None:
+        """
+        Open pooled contexts ahead of the first lease so plans skip that setup.
+        
+        Args:
+            count: Contexts to have open afterwards (capped at POOL_SIZE)
+        """
+        if self.browser is None:
+            await self.start()
+        
+        while self._ctx_created < min(count, POOL_SIZE):
+            self._ctx_created += 1
+            try:
+                page = await self._new_pooled_page()
+            except Exception:
+                self._ctx_created -= 1
+                raise
+            self._ctx_pool.put_nowait(page)
+    
+    async def _new_pooled_page(self) -> Page:
+        """Create a fresh context + page for the pool."""
+        assert self.browser is not None, "start() must run before pooling contexts"
+        context = await self.browser.new_context()
+        page = await context.new_page()
+        page.set_default_timeout(self.timeout_ms)
+        self._ctx_uses[id(context)] = 0
+        self._pool_stats["created"] += 1
+        logger.info(f"Pooled browser context created ({self._ctx_created}/{POOL_SIZE})")
+        return page
+    
     async def start(self) -> None:
         """Start the browser."""
         try:
@@ -53,8 +207,9 @@ class BrowserController:
                 args=["--start-maximized"],
             )
             self.context = await self.browser.new_context()
-            self.page = await self.context.new_page()
-            self.page.set_default_timeout(self.timeout_ms)
+            page = await self.context.new_page()
+            page.set_default_timeout(self.timeout_ms)
+            self.page = page
 
             logger.info(f"Browser started (headless={self.headless})")
         except Exception as e:
@@ -64,8 +219,8 @@ class BrowserController:
     async def stop(self) -> None:
         """Stop the browser."""
         try:
-            if self.page:
-                await self.page.close()
+            if self._default_page:
+                await self._default_page.close()
             if self.context:
                 await self.context.close()
             if self.browser:
@@ -76,6 +231,11 @@ class BrowserController:
             self.page = None
             self.context = None
             self.browser = None
+            # Pooled contexts closed with the browser
+            self._ctx_pool = asyncio.Queue()
+            self._ctx_created = 0
+            self._ctx_uses.clear()
+            self._pool_gen += 1
 
             logger.info("Browser stopped successfully")
         except Exception as e:
@@ -87,6 +247,14 @@ class BrowserController:
             logger.info("[BrowserController] Auto-starting browser (lazy init)...")
             await self.start()
 
+    async def _started_page(self) -> Page:
+        """ensure_started(), then return the page actions should run on."""
+        await self.ensure_started()
+        page = self.page
+        if page is None:
+            raise RuntimeError("Browser not started. Call start() first.")
+        return page
+
     async def open_url(self, url: str) -> str:
         """
         Open a URL in the browser.
@@ -97,14 +265,14 @@ class BrowserController:
         Returns:
             Success message
         """
-        await self.ensure_started()
+        page = await self._started_page()
         
         try:
             if not url.startswith(("http://", "https://")):
                 url = f"https://{url}"
             
             logger.info(f"Opening URL: {url}")
-            await self.page.goto(url, wait_until="domcontentloaded")
+            await page.goto(url, wait_until="domcontentloaded")
             
             return f"Successfully opened {url}"
         except PlaywrightTimeoutError:
@@ -125,7 +293,8 @@ class BrowserController:
         Returns:
             Success message
         """
-        if not self.page:
+        page = self.page
+        if not page:
             raise RuntimeError("Browser not started. Call start() first.")
         
         try:
@@ -142,13 +311,13 @@ class BrowserController:
                 raise ValueError(f"Unsupported search engine: {search_engine}")
             
             # Fill search box
-            await self.page.fill(search_box_selector, query)
+            await page.fill(search_box_selector, query)
             
             # Press enter
-            await self.page.press(search_box_selector, "Enter")
+            await page.press(search_box_selector, "Enter")
             
             # Wait for results
-            await self.page.wait_for_load_state("networkidle")
+            await page.wait_for_load_state("networkidle")
             
             return f"Successfully searched for '{query}' on {search_engine}"
         except Exception as e:
@@ -165,17 +334,17 @@ class BrowserController:
         Returns:
             Success message
         """
-        await self.ensure_started()
+        page = await self._started_page()
         
         try:
             logger.info(f"Clicking element: {selector}")
             
             # Wait for element to be visible
-            await self.page.wait_for_selector(selector, state="visible")
-            await self.page.click(selector)
+            await page.wait_for_selector(selector, state="visible")
+            await page.click(selector)
             
             # Wait for navigation/load
-            await self.page.wait_for_load_state("networkidle")
+            await page.wait_for_load_state("networkidle")
             
             return f"Successfully clicked element: {selector}"
         except PlaywrightTimeoutError:
@@ -188,6 +357,9 @@ class BrowserController:
     async def click_first_result(self) -> str:
         """Click the first search result."""
         try:
+            page = self.page
+            if page is None:
+                raise RuntimeError("Browser not started. Call start() first.")
             # Common selectors for first result
             selectors = [
                 "div[data-sokoban-container] a.YmvwI",  # Google search result
@@ -197,7 +369,7 @@ class BrowserController:
             
             for selector in selectors:
                 try:
-                    await self.page.wait_for_selector(selector, state="visible", timeout=2000)
+                    await page.wait_for_selector(selector, state="visible", timeout=2000)
                     await self.click(selector)
                     return "Successfully clicked first result"
                 except:
@@ -219,18 +391,18 @@ class BrowserController:
         Returns:
             Success message
         """
-        await self.ensure_started()
+        page = await self._started_page()
         
         try:
             logger.info(f"Scrolling {direction} {amount} times")
             
             for _ in range(amount):
                 if direction.lower() == "down":
-                    await self.page.evaluate(
+                    await page.evaluate(
                         "window.scrollBy(0, window.innerHeight)"
                     )
                 else:
-                    await self.page.evaluate(
+                    await page.evaluate(
                         "window.scrollBy(0, -window.innerHeight)"
                     )
                 await asyncio.sleep(0.5)
@@ -240,28 +412,47 @@ class BrowserController:
             logger.error(f"Scroll failed: {e}")
             raise
     
-    async def extract_text(self, selector: Optional[str] = None) -> str:
+    async def extract_text(
+        self,
+        selector: Optional[str] = None,
+        max_chars: Optional[int] = None
+    ) -> str:
         """
         Extract text content from the page or a specific element.
         
         Args:
             selector: Optional CSS selector to extract from specific element
+            max_chars: Optional limit; text is truncated in the page so the
+                full string is never sent back to Python
             
         Returns:
             Extracted text
         """
-        await self.ensure_started()
+        page = await self._started_page()
         
         try:
             if selector:
                 logger.info(f"Extracting text from: {selector}")
-                await self.page.wait_for_selector(selector)
-                text = await self.page.text_content(selector)
+                await page.wait_for_selector(selector)
+                if max_chars is None:
+                    text = await page.text_content(selector)
+                else:
+                    text = await page.eval_on_selector(
+                        selector,
+                        "(el, n) => (el.textContent || '').trim().slice(0, n)",
+                        max_chars
+                    )
             else:
                 logger.info("Extracting all visible text")
-                text = await self.page.evaluate(
-                    "() => document.body.innerText"
-                )
+                if max_chars is None:
+                    text = await page.evaluate(
+                        "() => document.body.innerText"
+                    )
+                else:
+                    text = await page.evaluate(
+                        "(n) => document.body.innerText.trim().slice(0, n)",
+                        max_chars
+                    )
             
             return text.strip() if text else ""
         except Exception as e:
@@ -279,13 +470,13 @@ class BrowserController:
         Returns:
             Success message
         """
-        await self.ensure_started()
+        page = await self._started_page()
         
         try:
             logger.info(f"Filling input {selector} with value: {value}")
             
-            await self.page.wait_for_selector(selector)
-            await self.page.fill(selector, value)
+            await page.wait_for_selector(selector)
+            await page.fill(selector, value)
             
             return f"Successfully filled input: {selector}"
         except Exception as e:
@@ -308,12 +499,12 @@ class BrowserController:
     
     async def navigate_back(self) -> str:
         """Navigate back in browser history."""
-        await self.ensure_started()
+        page = await self._started_page()
         
         try:
             logger.info("Navigating back")
-            await self.page.go_back()
-            await self.page.wait_for_load_state("networkidle")
+            await page.go_back()
+            await page.wait_for_load_state("networkidle")
             return "Successfully navigated back"
         except Exception as e:
             logger.error(f"Navigate back failed: {e}")
@@ -321,10 +512,10 @@ class BrowserController:
     
     async def get_current_url(self) -> str:
         """Get current page URL."""
-        await self.ensure_started()
-        return self.page.url
+        page = await self._started_page()
+        return page.url
     
     async def get_title(self) -> str:
         """Get current page title."""
-        await self.ensure_started()
-        return await self.page.title()
+        page = await self._started_page()
+        return await page.title()
@@ -15,10 +15,16 @@ Version: 1.0.0
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional
+import inspect
+import itertools
+import re
+import time
+from typing import Dict, Any, List, Optional, Tuple, AsyncGenerator, AsyncIterator, Callable
 from datetime import datetime
 
+from .config import settings
 from .planner import ActionDecision
+from .page_analyzer import index_elements_by_selector
 from .llm_client import LLMClient
 from .utils.logger import get_logger
 
@@ -31,8 +37,17 @@ logger = get_logger(__name__)
 # ============================================================================
 
 EXPLANATION_TEMPERATURE = 0.3  # Deterministic responses
-EXPLANATION_MAX_TOKENS = 150
-EXPLANATION_TIMEOUT = 5.0  # seconds
+EXPLANATION_MAX_TOKENS_SHORT = 80  # decision / result explanations
+SUMMARY_MAX_TOKENS = 160  # run summaries
+EXPLANATION_STOP = ["\n\n"]  # stop decoding at the first paragraph break
+EXPLANATION_TIMEOUT = 3.0  # seconds (hedging keeps the tail well below this)
+TEMPLATED_CONFIDENCE_THRESHOLD = 0.8  # Above this, known actions skip the LLM
+
+# Circuit breaker: after BREAKER_MAX_FAILURES LLM failures within
+# BREAKER_WINDOW seconds, skip the LLM for BREAKER_COOLDOWN seconds
+BREAKER_MAX_FAILURES = 3
+BREAKER_WINDOW = 10.0  # seconds
+BREAKER_COOLDOWN = 30.0  # seconds
 
 # Action → Human-readable mapping
 ACTION_DESCRIPTIONS = {
@@ -44,6 +59,7 @@ ACTION_DESCRIPTIONS = {
     "navigate": "navigating",
     "finish": "completing",
 }
+_action_desc = ACTION_DESCRIPTIONS.get  # bound once; used on every prompt
 
 # Status → Message mapping
 STATUS_MESSAGES = {
@@ -52,6 +68,125 @@ STATUS_MESSAGES = {
     "completed": "is done",
 }
 
+# Final status → summary prompt wording
+_STATUS_DESC = {
+    "completed": "successfully completed",
+    "max_steps_reached": "reached maximum attempts",
+    "loop_detected": "detected a repetitive pattern",
+    "error": "encountered an error",
+}
+
+# Rule-based fallback templates (used when the LLM is skipped or fails)
+_DECISION_FALLBACKS = {
+    "click": "I found a relevant button to click based on your goal.",
+    "type": "I located a search field and will enter your query.",
+    "read": "I'm reading the page to find relevant information.",
+    "scroll": "I'm scrolling to explore more content on this page.",
+    "wait": "I'm pausing briefly for the page to load.",
+    "navigate": "I'm navigating to the next relevant page.",
+    "finish": "I've found what you were looking for!",
+}
+_DEFAULT_DECISION_FALLBACK = "I am performing the next step to move closer to your goal."
+
+_RESULT_SUCCESS_FALLBACKS = {
+    "click": "The click was successful and the page has updated.",
+    "type": "I've entered the information successfully.",
+    "read": "I've analyzed the page content.",
+    "scroll": "I've scrolled to show more content.",
+    "navigate": "I've navigated to the page successfully.",
+    "finish": "The task is complete!",
+}
+_DEFAULT_RESULT_SUCCESS_FALLBACK = "That action completed successfully."
+
+# Format strings; only the selected one is formatted with the goal
+_SUMMARY_FALLBACKS = {
+    "completed": "✓ I successfully worked on your request: {goal}",
+    "max_steps_reached": "I attempted to complete your request ({goal}) but reached my attempt limit. You may need to refine the request.",
+    "loop_detected": "I was working on '{goal}' but detected a repetitive pattern, so I stopped to prevent an infinite loop.",
+    "error": "I encountered an error while trying to complete: {goal}",
+}
+_DEFAULT_SUMMARY_FALLBACK = "Task execution completed with status: {status}"
+
+# Known actions / statuses whose rule-based templates are good enough
+_KNOWN_SIMPLE_ACTIONS = frozenset(ACTION_DESCRIPTIONS)
+_TEMPLATED_STATUSES = frozenset({"success", "completed", "failed"})
+
+# Run summary prompt (bound .format so the template is parsed once)
+_SUMMARY_TEMPLATE = """You are an intelligent browser automation assistant.
+
+Summarize what happened during task execution.
+
+USER GOAL: {goal}
+FINAL STATUS: {status_desc}
+STEPS TAKEN: {steps}
+ACTION SEQUENCE: {seq}
+
+Generate a brief, friendly 2-3 sentence summary of the execution.
+If successful, describe what was accomplished.
+If there were issues, be helpful and supportive.
+Use natural, conversational language.
+
+Summary:""".format
+
+
+# ============================================================================
+# Streamed response cleaning
+# ============================================================================
+
+class _StreamCleaner:
+    """
+    Incremental ChatResponder._clean_response for streamed text.
+    
+    Text is released only once another whitespace-separated token follows
+    it, so a selector split across deltas is removed whole and the final
+    strip / 300-char cap give the same text as cleaning the full response.
+    """
+    
+    # Held back: the last token, the whitespace before it and any after it
+    _HELD_TAIL = re.compile(r"\s+\S+\s*$")
+    
+    def __init__(self, remove_selectors: Callable[[str], str], limit: int = 300):
+        self._remove_selectors = remove_selectors
+        self._limit = limit
+        self._pending = ""   # raw text not yet cleaned
+        self._started = False
+        self._ws = ""        # trailing whitespace of cleaned text, not yet released
+        self._out = 0        # cleaned chars released
+        self.truncated = False
+    
+    def feed(self, delta: str) -> str:
+        """Add a delta; return the cleaned text that is now final."""
+        self._pending += delta
+        m = self._HELD_TAIL.search(self._pending)
+        if m is None or m.start() == 0:
+            return ""
+        ready, self._pending = self._pending[:m.start()], self._pending[m.start():]
+        return self._release(ready)
+    
+    def finish(self) -> str:
+        """Return the cleaned remainder at end of stream."""
+        tail, self._pending = self._pending.rstrip().rstrip('"\''), ""
+        text = self._release(tail)
+        if not self.truncated:
+            text += self._ws
+            self._ws = ""
+        return text
+    
+    def _release(self, raw: str) -> str:
+        if self.truncated:
+            return ""
+        if not self._started:
+            raw = raw.lstrip().lstrip('"\'')
+            self._started = True
+        text = self._ws + self._remove_selectors(raw)
+        if self._out + len(text) > self._limit:
+            self.truncated = True
+            return text[:self._limit - self._out].rstrip() + "..."
+        body = text.rstrip()
+        self._ws = text[len(body):]
+        self._out += len(body)
+        return body
+
 
 # ============================================================================
 # ChatResponder Class
@@ -71,9 +206,11 @@ class ChatResponder:
     
     Attributes:
         llm_client: LLMClient instance for LLM generation
-        _logger: Configured logger instance
+        _logger: Logger shared by all instances
     """
     
+    _logger = get_logger("chat_responder")
+    
     def __init__(self, llm_client: LLMClient):
         """
         Initialize chat responder.
@@ -82,8 +219,10 @@ class ChatResponder:
             llm_client: LLMClient instance for LLM calls
         """
         self.llm_client = llm_client
-        self._logger = get_logger(f"chat_responder.{id(self)}")
-        self._logger.debug("ChatResponder initialized")
+        # LLMClient.generate_response is async; sync clients go via a thread
+        self._llm_is_async = inspect.iscoroutinefunction(llm_client.generate_response)
+        self._breaker = {"fails": 0, "first_fail": 0.0, "open_until": 0.0}
+        self._logger.debug("ChatResponder %s initialized", id(self))
     
     async def explain_decision(
         self,
@@ -107,10 +246,20 @@ class ChatResponder:
             Natural language explanation (max 2 sentences)
         """
         self._logger.debug(
-            f"Explaining decision: {decision.action} "
-            f"(confidence: {decision.confidence:.2f})"
+            "Explaining decision: %s (confidence: %.2f)",
+            decision.action, decision.confidence
         )
         
+        # Fast path: templated explanation for routine, high-confidence steps
+        if not settings.LLM_EXPLANATIONS_ENABLED or (
+            decision.action in _KNOWN_SIMPLE_ACTIONS
+            and decision.confidence > TEMPLATED_CONFIDENCE_THRESHOLD
+        ):
+            return self._fallback_decision_explanation(decision)
+        
+        if self._breaker_open():
+            return self._fallback_decision_explanation(decision)
+        
         try:
             # Build explanation prompt
             prompt = self._build_decision_prompt(goal, decision, page_state)
@@ -124,7 +273,7 @@ class ChatResponder:
             if not explanation:
                 raise ValueError("Empty response from LLM")
             
-            self._logger.debug(f"Generated explanation: {explanation[:100]}...")
+            self._logger.debug("Generated explanation: %.100s...", explanation)
             return explanation
         
         except Exception as e:
@@ -151,9 +300,19 @@ class ChatResponder:
             Natural language explanation (max 2 sentences)
         """
         self._logger.debug(
-            f"Explaining result: {result.get('status')} for {decision.action}"
+            "Explaining result: %s for %s", result.get("status"), decision.action
         )
         
+        # Fast path: templated explanation for common statuses
+        if (
+            not settings.LLM_EXPLANATIONS_ENABLED
+            or result.get("status") in _TEMPLATED_STATUSES
+        ):
+            return self._fallback_result_explanation(decision, result)
+        
+        if self._breaker_open():
+            return self._fallback_result_explanation(decision, result)
+        
         try:
             # Build result explanation prompt
             prompt = self._build_result_prompt(decision, result)
@@ -167,7 +326,7 @@ class ChatResponder:
             if not explanation:
                 raise ValueError("Empty response from LLM")
             
-            self._logger.debug(f"Generated result explanation: {explanation[:100]}...")
+            self._logger.debug("Generated result explanation: %.100s...", explanation)
             return explanation
         
         except Exception as e:
@@ -175,6 +334,34 @@ class ChatResponder:
             fallback = self._fallback_result_explanation(decision, result)
             return fallback
     
+    async def explain_step(
+        self,
+        goal: str,
+        decision: ActionDecision,
+        page_state: Dict[str, Any],
+        result: Dict[str, Any]
+    ) -> Tuple[str, str]:
+        """
+        Explain a decision and its execution result concurrently.
+        
+        Both explanations are independent LLM calls, so issuing them
+        together costs roughly one round-trip instead of two.
+        
+        Args:
+            goal: User's goal
+            decision: ActionDecision made by planner
+            page_state: Page state the decision was made on
+            result: ActionExecutor result dict
+            
+        Returns:
+            Tuple of (decision_explanation, result_explanation)
+        """
+        decision_text, result_text = await asyncio.gather(
+            self.explain_decision(goal, decision, page_state),
+            self.explain_execution_result(decision, result)
+        )
+        return decision_text, result_text
+    
     async def summarize_run(
         self,
         goal: str,
@@ -199,9 +386,12 @@ class ChatResponder:
             Human-readable summary (2-4 sentences)
         """
         self._logger.debug(
-            f"Summarizing run: {final_status} ({steps_taken} steps)"
+            "Summarizing run: %s (%d steps)", final_status, steps_taken
         )
         
+        if not settings.LLM_EXPLANATIONS_ENABLED or self._breaker_open():
+            return self._fallback_summary(goal, final_status, steps_taken)
+        
         try:
             # Build summary prompt
             prompt = self._build_summary_prompt(
@@ -212,7 +402,9 @@ class ChatResponder:
             )
             
             # Generate summary
-            summary = await self._call_llm_with_timeout(prompt)
+            summary = await self._call_llm_with_timeout(
+                prompt, max_tokens=SUMMARY_MAX_TOKENS
+            )
             
             # Clean and validate
             summary = self._clean_response(summary)
@@ -220,7 +412,7 @@ class ChatResponder:
             if not summary:
                 raise ValueError("Empty response from LLM")
             
-            self._logger.debug(f"Generated summary: {summary[:100]}...")
+            self._logger.debug("Generated summary: %.100s...", summary)
             return summary
         
         except Exception as e:
@@ -228,6 +420,75 @@ class ChatResponder:
             fallback = self._fallback_summary(goal, final_status, steps_taken)
             return fallback
     
+    async def summarize_run_stream(
+        self,
+        goal: str,
+        execution_history: List[Dict[str, Any]],
+        final_status: str,
+        steps_taken: int = 0
+    ) -> AsyncIterator[str]:
+        """
+        Stream the run summary as it is generated.
+        
+        Yields text chunks so the caller can forward the first tokens
+        immediately; together they match what summarize_run's cleaning
+        would produce for the same output. Falls back to the rule-based summary (one chunk) if the
+        LLM is disabled, unavailable, or fails before producing output.
+        
+        Args:
+            goal: Original user goal
+            execution_history: List of step records
+            final_status: Final completion status
+            steps_taken: Number of steps taken
+            
+        Yields:
+            Summary text chunks
+        """
+        if not settings.LLM_EXPLANATIONS_ENABLED or self._breaker_open():
+            yield self._fallback_summary(goal, final_status, steps_taken)
+            return
+        
+        prompt = self._build_summary_prompt(
+            goal=goal,
+            execution_history=execution_history,
+            final_status=final_status,
+            steps_taken=steps_taken
+        )
+        stream: AsyncGenerator[str, None] = self.llm_client.stream_response(
+            prompt=prompt,
+            temperature=EXPLANATION_TEMPERATURE,
+            max_tokens=SUMMARY_MAX_TOKENS,
+            stop=EXPLANATION_STOP
+        )
+        cleaner = _StreamCleaner(self._remove_selectors)
+        emitted = 0
+        
+        try:
+            # Bound time-to-first-token; later chunks arrive at decode speed
+            chunk = await asyncio.wait_for(anext(stream, None), timeout=EXPLANATION_TIMEOUT)
+            while chunk is not None and not cleaner.truncated:
+                text = cleaner.feed(chunk)
+                if text:
+                    emitted += len(text)
+                    yield text
+                chunk = await anext(stream, None)
+            
+            text = cleaner.finish()
+            if text:
+                emitted += len(text)
+                yield text
+            
+            if emitted == 0:
+                raise ValueError("Empty response from LLM")
+            self._record_llm_success()
+        except Exception as e:
+            self._logger.warning(f"LLM summary stream failed: {e}")
+            self._record_llm_failure()
+            if emitted == 0:
+                yield self._fallback_summary(goal, final_status, steps_taken)
+        finally:
+            await stream.aclose()
+    
     # ========================================================================
     # Prompt Builders
     # ========================================================================
@@ -249,8 +510,6 @@ class ChatResponder:
         Returns:
             Formatted prompt
         """
-        action = ACTION_DESCRIPTIONS.get(decision.action, decision.action)
-        
         # Extract relevant page elements for context
         page_context = self._extract_page_context(page_state, decision)
         
@@ -290,7 +549,7 @@ Explanation:"""
         Returns:
             Formatted prompt
         """
-        action = ACTION_DESCRIPTIONS.get(decision.action, decision.action)
+        action = _action_desc(decision.action, decision.action)
         status = result.get("status", "unknown")
         details = result.get("details", "")
         
@@ -330,49 +589,41 @@ Explanation:"""
         Returns:
             Formatted prompt
         """
-        # Extract action sequence
-        actions: List[str] = [
-            str(step.get("decision", {}).get("action") or "unknown")
-            for step in execution_history[:10]  # Limit to first 10
+        # Extract action sequence (first 10 steps)
+        actions_desc = [
+            _action_desc(action, action)
+            for action in (
+                str(step.get("decision", {}).get("action") or "unknown")
+                for step in itertools.islice(execution_history, 10)
+            )
         ]
-        action_sequence = " → ".join([ACTION_DESCRIPTIONS.get(a, a) for a in actions])
+        action_sequence = " → ".join(actions_desc)
         
         # Status description
-        status_desc = {
-            "completed": "successfully completed",
-            "max_steps_reached": "reached maximum attempts",
-            "loop_detected": "detected a repetitive pattern",
-            "error": "encountered an error",
-        }.get(final_status, final_status)
+        status_desc = _STATUS_DESC.get(final_status, final_status)
         
-        prompt = f"""You are an intelligent browser automation assistant.
-
-Summarize what happened during task execution.
-
-USER GOAL: {goal}
-FINAL STATUS: {status_desc}
-STEPS TAKEN: {steps_taken}
-ACTION SEQUENCE: {action_sequence}
-
-Generate a brief, friendly 2-3 sentence summary of the execution.
-If successful, describe what was accomplished.
-If there were issues, be helpful and supportive.
-Use natural, conversational language.
-
-Summary:"""
-        
-        return prompt
+        return _SUMMARY_TEMPLATE(
+            goal=goal,
+            status_desc=status_desc,
+            steps=steps_taken,
+            seq=action_sequence
+        )
     
     # ========================================================================
     # LLM Interaction
     # ========================================================================
     
-    async def _call_llm_with_timeout(self, prompt: str) -> str:
+    async def _call_llm_with_timeout(
+        self,
+        prompt: str,
+        max_tokens: int = EXPLANATION_MAX_TOKENS_SHORT
+    ) -> str:
         """
         Call LLM with timeout and error handling.
         
         Args:
             prompt: Prompt to send
+            max_tokens: Generation budget for this call
             
         Returns:
             LLM response text
@@ -381,35 +632,141 @@ Summary:"""
             Exception: If LLM call fails
         """
         try:
-            response = await asyncio.wait_for(
-                self._call_llm(prompt),
-                timeout=EXPLANATION_TIMEOUT
-            )
+            response = await self._call_llm_hedged(prompt, max_tokens)
+            self._record_llm_success()
             return response
         except asyncio.TimeoutError:
             self._logger.warning("LLM explanation timeout")
+            self._record_llm_failure()
             raise TimeoutError("LLM response timeout")
         except Exception as e:
             self._logger.warning(f"LLM call failed: {e}")
+            self._record_llm_failure()
             raise
     
-    async def _call_llm(self, prompt: str) -> str:
+    async def _call_llm_hedged(self, prompt: str, max_tokens: int) -> str:
+        """
+        Call the LLM with request hedging.
+        
+        If the first call hasn't answered after HEDGE_DELAY_MS, an identical
+        second call is fired and whichever succeeds first wins; the loser is
+        cancelled. Explanations are idempotent, so the duplicate is safe.
+        
+        Args:
+            prompt: Prompt to send
+            max_tokens: Generation budget for this call
+            
+        Returns:
+            LLM response text
+            
+        Raises:
+            asyncio.TimeoutError: If nothing succeeds within EXPLANATION_TIMEOUT
+            Exception: Last LLM error if every attempt failed
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + EXPLANATION_TIMEOUT
+        hedge_delay = settings.HEDGE_DELAY_MS / 1000
+        pending = {asyncio.create_task(self._call_llm(prompt, max_tokens))}
+        hedged = hedge_delay <= 0 or hedge_delay >= EXPLANATION_TIMEOUT
+        last_error: Optional[BaseException] = None
+        
+        try:
+            while pending:
+                wait_until = deadline if hedged else min(deadline, loop.time() + hedge_delay)
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(wait_until - loop.time(), 0),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                for task in done:
+                    error = task.exception()
+                    if error is None and not task.result().startswith("LLM_ERROR"):
+                        return task.result()
+                    last_error = error or RuntimeError(task.result())
+                
+                if not done and not hedged:
+                    self._logger.debug("Hedging slow LLM call after %dms", settings.HEDGE_DELAY_MS)
+                    # The hedge must be a real second request, not a join
+                    pending.add(asyncio.create_task(
+                        self._call_llm(prompt, max_tokens, coalesce=False)
+                    ))
+                    hedged = True
+                elif not done:
+                    raise asyncio.TimeoutError()
+            
+            raise last_error or RuntimeError("LLM call failed")
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    # ========================================================================
+    # Circuit Breaker
+    # ========================================================================
+    
+    def _breaker_open(self) -> bool:
+        """
+        Check whether LLM calls are currently being skipped.
+        
+        Returns:
+            True if the breaker is open (use fallbacks)
+        """
+        return time.monotonic() < self._breaker["open_until"]
+    
+    def _record_llm_success(self) -> None:
+        """Reset the breaker after a successful LLM call."""
+        self._breaker["fails"] = 0
+        self._breaker["open_until"] = 0.0
+    
+    def _record_llm_failure(self) -> None:
+        """Count a failed LLM call and open the breaker if needed."""
+        now = time.monotonic()
+        breaker = self._breaker
+        
+        if now - breaker["first_fail"] > BREAKER_WINDOW:
+            breaker["fails"] = 0
+        if breaker["fails"] == 0:
+            breaker["first_fail"] = now
+        breaker["fails"] += 1
+        
+        if breaker["fails"] >= BREAKER_MAX_FAILURES:
+            breaker["open_until"] = now + BREAKER_COOLDOWN
+            breaker["fails"] = 0
+            self._logger.warning(
+                f"LLM circuit breaker open for {BREAKER_COOLDOWN:.0f}s, using fallbacks"
+            )
+    
+    async def _call_llm(
+        self,
+        prompt: str,
+        max_tokens: int = EXPLANATION_MAX_TOKENS_SHORT,
+        coalesce: bool = True
+    ) -> str:
         """
         Call LLM client (async wrapper).
         
         Args:
             prompt: Prompt to send
+            max_tokens: Generation budget for this call
+            coalesce: Allow an async client to join an identical request
+                already in flight; False forces a separate request
             
         Returns:
             LLM response
         """
-        # Run in executor to avoid blocking
-        return await asyncio.to_thread(
-            self.llm_client.generate_response,
-            prompt=prompt,
-            temperature=EXPLANATION_TEMPERATURE,
-            max_tokens=EXPLANATION_MAX_TOKENS
-        )
+        kwargs = {
+            "prompt": prompt,
+            "temperature": EXPLANATION_TEMPERATURE,
+            "max_tokens": max_tokens,
+            "stop": EXPLANATION_STOP,
+        }
+        if self._llm_is_async:
+            if not coalesce:
+                kwargs["coalesce"] = False
+            return await self.llm_client.generate_response(**kwargs)
+        
+        # Sync client: run in executor to avoid blocking
+        return await asyncio.to_thread(self.llm_client.generate_response, **kwargs)
     
     # ========================================================================
     # Response Processing
@@ -471,22 +828,7 @@ Summary:"""
         Returns:
             Explanation text
         """
-        action = ACTION_DESCRIPTIONS.get(decision.action, decision.action)
-        
-        explanations = {
-            "click": f"I found a relevant button to click based on your goal.",
-            "type": f"I located a search field and will enter your query.",
-            "read": f"I'm reading the page to find relevant information.",
-            "scroll": f"I'm scrolling to explore more content on this page.",
-            "wait": f"I'm pausing briefly for the page to load.",
-            "navigate": f"I'm navigating to the next relevant page.",
-            "finish": f"I've found what you were looking for!",
-        }
-        
-        return explanations.get(
-            decision.action,
-            "I am performing the next step to move closer to your goal."
-        )
+        return _DECISION_FALLBACKS.get(decision.action, _DEFAULT_DECISION_FALLBACK)
     
     def _fallback_result_explanation(
         self,
@@ -503,21 +845,12 @@ Summary:"""
         Returns:
             Explanation text
         """
-        action = ACTION_DESCRIPTIONS.get(decision.action, decision.action)
         status = result.get("status", "unknown")
         
         if status == "success":
-            explanations = {
-                "click": "The click was successful and the page has updated.",
-                "type": "I've entered the information successfully.",
-                "read": "I've analyzed the page content.",
-                "scroll": "I've scrolled to show more content.",
-                "navigate": "I've navigated to the page successfully.",
-                "finish": "The task is complete!",
-            }
-            return explanations.get(
+            return _RESULT_SUCCESS_FALLBACKS.get(
                 decision.action,
-                "That action completed successfully."
+                _DEFAULT_RESULT_SUCCESS_FALLBACK
             )
         elif status == "completed":
             return "The task has been completed successfully."
@@ -541,17 +874,8 @@ Summary:"""
         Returns:
             Summary text
         """
-        summaries = {
-            "completed": f"✓ I successfully worked on your request: {goal}",
-            "max_steps_reached": f"I attempted to complete your request ({goal}) but reached my attempt limit. You may need to refine the request.",
-            "loop_detected": f"I was working on '{goal}' but detected a repetitive pattern, so I stopped to prevent an infinite loop.",
-            "error": f"I encountered an error while trying to complete: {goal}",
-        }
-        
-        return summaries.get(
-            final_status,
-            f"Task execution completed with status: {final_status}"
-        )
+        template = _SUMMARY_FALLBACKS.get(final_status, _DEFAULT_SUMMARY_FALLBACK)
+        return template.format(goal=goal, status=final_status)
     
     # ========================================================================
     # Utilities
@@ -580,29 +904,21 @@ Summary:"""
             context_parts.append(f"Page: {title}")
         
         # Add relevant elements for decision
-        if decision.action == "click":
-            # Find the element being clicked
-            found_click_target = False
-            for btn in page_state.get("buttons", []):
-                btn_item: Dict[str, Any] = btn
-                if btn_item.get("selector") == decision.target_selector:
-                    context_parts.append(f"Button: {btn_item.get('text', 'button')}")
-                    found_click_target = True
-                    break
-            if not found_click_target:
-                for link in page_state.get("links", []):
-                    link_item: Dict[str, Any] = link
-                    if link_item.get("selector") == decision.target_selector:
-                        context_parts.append(f"Link: {link_item.get('text', 'link')}")
-                        break
-        
-        elif decision.action == "type":
-            # Find the input field
-            for inp in page_state.get("inputs", []):
-                if inp.get("selector") == decision.target_selector:
-                    placeholder = inp.get("placeholder") or inp.get("name", "input field")
+        if decision.action in ("click", "type") and decision.target_selector:
+            by_selector = page_state.get("_by_selector")
+            if by_selector is None:
+                by_selector = index_elements_by_selector(page_state)
+            hit = by_selector.get(decision.target_selector)
+            
+            if hit:
+                kind, element = hit
+                if decision.action == "click" and kind == "button":
+                    context_parts.append(f"Button: {element.get('text', 'button')}")
+                elif decision.action == "click" and kind == "link":
+                    context_parts.append(f"Link: {element.get('text', 'link')}")
+                elif decision.action == "type" and kind == "input":
+                    placeholder = element.get("placeholder") or element.get("name", "input field")
                     context_parts.append(f"Input: {placeholder}")
-                    break
         
         # Add visible text summary
         text = page_state.get("main_text_summary", "")
@@ -1,8 +1,10 @@
 """
 Configuration module for the Agent.
-Centralizes all configuration in one place.
+Centralizes all configuration in one place — other modules read defaults
+from ``settings`` rather than calling os.getenv with their own fallbacks.
 """
 
+from functools import lru_cache
 from typing import Optional
 
 try:
@@ -25,11 +27,27 @@ class Settings(BaseSettings):
     LLM_TIMEOUT: int = 120
     LLM_TEMPERATURE: float = 0.7
     LLM_MAX_TOKENS: int = 256
+    # Weight format of the served model (informational; the server decides).
+    # Q4_K_M GGUF on llama.cpp/LM Studio roughly doubles decode tok/s.
+    LLM_QUANTIZATION: str = "q4_k_m"
+    # Small draft model for speculative decoding (must share the main model's
+    # tokenizer). Sent as "draft_model" to LM Studio; vLLM / llama.cpp take it
+    # at server launch instead (--speculative-model / --model-draft).
+    LLM_DRAFT_MODEL: Optional[str] = None
+    LLM_EXPLANATIONS_ENABLED: bool = True  # False → ChatResponder uses templates only
+    HEDGE_DELAY_MS: int = 400  # Duplicate slow explanation calls after this; 0 disables
 
     # Browser Configuration
     BROWSER_HEADLESS: bool = False
     BROWSER_TIMEOUT_MS: int = 30000
     BROWSER_AUTO_RETRY: bool = True
+    # Run each Executor plan on its own pooled BrowserContext (opened at
+    # startup, replaced if it fails). Off: plans continue on one shared page.
+    BROWSER_CONTEXT_POOL: bool = False
+    # Keep a second, idle browser launched after a stale-session reset so
+    # the next reset is instant. The session is headed, so this leaves an
+    # extra browser window open; off by default.
+    BROWSER_STANDBY: bool = False
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -42,7 +60,15 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = True
+        frozen = True  # read-only after load; also makes Settings hashable
+        validate_default = False  # defaults above are already well-typed
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings, reading .env only once."""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
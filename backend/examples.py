@@ -9,17 +9,66 @@ This demonstrates:
 """
 
 import asyncio
-import requests
+import httpx
+import importlib.util
 import json
-from typing import Optional
+import sys
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
 
-# For programmatic usage
-from .llm_client import LLMClient
-from .planner import Planner
-from .browser_controller import BrowserController
-from .executor import Executor
-from .agent_core import AutomationAgent
-from .agent_controller import AutonomousAgentController
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import uvloop  # installed with uvicorn[standard] on non-Windows platforms
+except ImportError:
+    uvloop = None
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime; names needed here only for annotations
+    from .browser_controller import BrowserController
+    from .llm_client import LLMClient
+
+# HTTP/2 needs the optional "h2" package (pip install httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+# Bytes read per network chunk when consuming the SSE stream
+SSE_READ_CHUNK = 65536
+
+
+def _split_sse_events(buf: bytes):
+    """
+    Parse every complete SSE event in *buf*.
+    
+    Args:
+        buf: Raw bytes received so far
+        
+    Returns:
+        (list of decoded ``data:`` payloads, unconsumed remainder)
+    """
+    *complete, rest = buf.split(b"\n\n")
+    events = [
+        _json_loads(line[6:])
+        for event in complete
+        for line in event.split(b"\n")
+        if line.startswith(b"data: ")
+    ]
+    return events, rest
+
+
+def _run(coro):
+    """asyncio.run(), on uvloop when it is available."""
+    if uvloop is None:
+        return asyncio.run(coro)
+    if sys.version_info >= (3, 12):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    uvloop.install()
+    return asyncio.run(coro)
 
 
 class AgentClient:
@@ -27,6 +76,33 @@ class AgentClient:
     
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
+        # One pooled client so repeated calls reuse keep-alive connections
+        self._session = httpx.Client(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=120.0
+        )
+        # Calls for the same session are sent one at a time, in order
+        self._session_locks: Dict[str, threading.Lock] = {}
+    
+    def _session_lock(self, session_id: Optional[str]) -> threading.Lock:
+        if session_id is None:
+            # New sessions have nothing to order against
+            return threading.Lock()
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = self._session_locks.setdefault(session_id, threading.Lock())
+        return lock
+    
+    def close(self):
+        """Close the underlying connection pool."""
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
     
     def send_message(self, message: str, session_id: Optional[str] = None) -> dict:
         """
@@ -44,11 +120,11 @@ class AgentClient:
             "session_id": session_id
         }
         
-        response = requests.post(
-            f"{self.base_url}/agent/message",
-            json=payload,
-            timeout=120
-        )
+        with self._session_lock(session_id):
+            response = self._session.post(
+                f"{self.base_url}/agent/message",
+                json=payload
+            )
         response.raise_for_status()
         return response.json()
     
@@ -68,19 +144,175 @@ class AgentClient:
             "session_id": session_id
         }
         
-        response = requests.post(
+        with self._session_lock(session_id), self._session.stream(
+            "POST",
             f"{self.base_url}/agent/message/stream",
-            json=payload,
-            stream=True,
-            timeout=120
+            json=payload
+        ) as response:
+            response.raise_for_status()
+            
+            buf = b""
+            for chunk in response.iter_bytes(chunk_size=SSE_READ_CHUNK):
+                events, buf = _split_sse_events(buf + chunk)
+                yield from events
+    
+    def get_session_info(self, session_id: str) -> dict:
+        """
+        Fetch session details from the agent.
+        
+        Args:
+            session_id: Session ID
+            
+        Returns:
+            Session info dictionary
+        """
+        response = self._session.get(
+            f"{self.base_url}/sessions/{session_id}",
+            timeout=10
+        )
+        return response.json()
+
+
+class AsyncAgentClient:
+    """Async client for streaming from the agent without blocking the event loop."""
+    
+    def __init__(self, base_url: str = "http://localhost:8000"):
+        self.base_url = base_url
+        self._client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=120.0
         )
+        # Calls for the same session are sent one at a time, in order
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+    
+    def _session_lock(self, session_id: Optional[str]) -> asyncio.Lock:
+        if session_id is None:
+            # New sessions have nothing to order against
+            return asyncio.Lock()
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = self._session_locks[session_id] = asyncio.Lock()
+        return lock
+    
+    async def aclose(self):
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def send_message(self, message: str, session_id: Optional[str] = None) -> dict:
+        """
+        Send a message to the agent.
+        
+        Args:
+            message: User message
+            session_id: Optional session ID
+            
+        Returns:
+            Response dictionary
+        """
+        payload = {
+            "message": message,
+            "session_id": session_id
+        }
+        
+        async with self._session_lock(session_id):
+            response = await self._client.post(
+                f"{self.base_url}/agent/message",
+                json=payload
+            )
         response.raise_for_status()
+        return response.json()
+    
+    async def stream_message(self, message: str, session_id: Optional[str] = None):
+        """
+        Stream a message to the agent.
+        
+        Args:
+            message: User message
+            session_id: Optional session ID
+            
+        Yields:
+            Status updates as they come
+        """
+        payload = {
+            "message": message,
+            "session_id": session_id
+        }
+        
+        async with self._session_lock(session_id), self._client.stream(
+            "POST",
+            f"{self.base_url}/agent/message/stream",
+            json=payload
+        ) as response:
+            response.raise_for_status()
+            
+            buf = b""
+            async for chunk in response.aiter_bytes(chunk_size=SSE_READ_CHUNK):
+                events, buf = _split_sse_events(buf + chunk)
+                for event in events:
+                    yield event
+
+
+# ============================================================================
+# Shared demo resources
+# ============================================================================
+
+# Browsers keyed by launch options, reused by every demo in this process
+_browser_pool: Dict[tuple, "BrowserController"] = {}
+_llm_client: Optional["LLMClient"] = None
+
+
+def get_browser(headless: bool = True) -> "BrowserController":
+    """
+    Get a pooled BrowserController, creating it on first use.
+    
+    Args:
+        headless: Run browser in headless mode
         
-        for line in response.iter_lines():
-            if line:
-                if line.startswith(b"data: "):
-                    data = json.loads(line[6:])
-                    yield data
+    Returns:
+        Shared BrowserController instance
+    """
+    from .browser_controller import BrowserController
+    
+    key = (headless,)
+    browser = _browser_pool.get(key)
+    if browser is None:
+        browser = _browser_pool[key] = BrowserController(headless=headless)
+    return browser
+
+
+def get_llm_client() -> "LLMClient":
+    """Get the shared LLMClient, creating it on first use."""
+    global _llm_client
+    if _llm_client is None:
+        from .llm_client import LLMClient
+        _llm_client = LLMClient()
+    return _llm_client
+
+
+async def shutdown_pool():
+    """Stop pooled browsers and close the shared LLM HTTP client."""
+    for browser in _browser_pool.values():
+        await browser.stop()
+    _browser_pool.clear()
+    
+    if _llm_client is not None:
+        from .llm_client import LLMClient
+        await LLMClient.aclose()
+
+
+async def _run_demo(demo):
+    """Run a demo coroutine, then release pooled resources on the same loop."""
+    try:
+        await demo
+    finally:
+        await shutdown_pool()
 
 
 async def demo_programmatic():
@@ -92,10 +324,15 @@ async def demo_programmatic():
     print("DEMO: Using Agent Directly (Programmatic)")
     print("=" * 60)
     
-    # Initialize components
-    llm = LLMClient()
+    # Imported here so the REST-only demos don't load the agent stack
+    from .planner import Planner
+    from .executor import Executor
+    from .agent_core import AutomationAgent
+    
+    # Initialize components (browser and LLM client are pooled)
+    llm = get_llm_client()
     planner = Planner(llm)
-    browser = BrowserController(headless=True)
+    browser = get_browser(headless=True)
     executor = Executor(browser)
     
     # Create agent
@@ -196,18 +433,17 @@ def demo_rest_api():
     if session_id:
         print(f"\n[3] Session Info:")
         try:
-            session_info = requests.get(
-                f"http://localhost:8000/sessions/{session_id}",
-                timeout=10
-            ).json()
+            session_info = client.get_session_info(session_id)
             print(f"  Session ID: {session_info['session_id']}")
             print(f"  History length: {session_info['history_length']}")
             print(f"  Pending approval: {session_info['has_pending_approval']}")
         except Exception as e:
             print(f"  Error: {e}")
+    
+    client.close()
 
 
-def demo_streaming():
+async def demo_streaming():
     """
     Demonstrate streaming responses with real-time updates.
     """
@@ -215,12 +451,12 @@ def demo_streaming():
     print("DEMO: Streaming Responses")
     print("=" * 60)
     
-    client = AgentClient()
+    client = AsyncAgentClient()
     
     print("\n[1] Streaming Chat Request:")
     try:
         print("  Sending: 'What are microservices?'")
-        for update in client.stream_message("What are microservices?"):
+        async for update in client.stream_message("What are microservices?"):
             print(f"  [{update['type'].upper()}] {update['content'][:60]}...")
             if update.get('is_final'):
                 break
@@ -232,12 +468,14 @@ def demo_streaming():
     try:
         print("  Sending: 'Search for React tutorials'")
         session_id = None
-        for update in client.stream_message("Search for React tutorials"):
+        async for update in client.stream_message("Search for React tutorials"):
             print(f"  [{update['type'].upper()}] {update['content'][:60]}...")
             if update.get('is_final'):
                 break
     except Exception as e:
         print(f"  Error: {e}")
+    
+    await client.aclose()
 
 
 async def demo_autonomous():
@@ -250,9 +488,13 @@ async def demo_autonomous():
     print("DEMO: Autonomous Goal-Driven Agent")
     print("=" * 60)
     
-    # Initialize components
-    llm = LLMClient()
-    browser = BrowserController(headless=True)
+    # Imported here so the REST-only demos don't load the agent stack
+    from .executor import Executor
+    from .agent_controller import AutonomousAgentController
+    
+    # Initialize components (browser and LLM client are pooled)
+    llm = get_llm_client()
+    browser = get_browser(headless=True)
     executor = Executor(browser)
     
     # Create autonomous agent
@@ -326,26 +568,26 @@ def demo_autonomous_rest():
         
     except Exception as e:
         print(f"  Error: {e}")
+    
+    client.close()
 
 
 if __name__ == "__main__":
-    import sys
-    
     print("Trial Automation Agent - Usage Examples\n")
     
     if len(sys.argv) > 1:
         if sys.argv[1] == "--programmatic":
             # Run programmatic demo
-            asyncio.run(demo_programmatic())
+            _run(_run_demo(demo_programmatic()))
         elif sys.argv[1] == "--stream":
             # Run streaming demo
-            demo_streaming()
+            _run(demo_streaming())
         elif sys.argv[1] == "--api":
             # Run REST API demo
             demo_rest_api()
         elif sys.argv[1] == "--autonomous":
             # Run autonomous agent demo
-            asyncio.run(demo_autonomous())
+            _run(_run_demo(demo_autonomous()))
         elif sys.argv[1] == "--autonomous-rest":
             # Run autonomous agent REST API demo
             demo_autonomous_rest()
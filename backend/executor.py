@@ -7,11 +7,19 @@ Contains:
 """
 
 import asyncio
+import inspect
+import logging
 import time
-from typing import Callable, List, Optional
+import weakref
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from playwright.async_api import Page
+
 from .models.schemas import ActionPlan, ActionType, GoalPlan, GoalStep
 from .browser_controller import BrowserController
-from .session_manager import _is_stale_error, get_session as _get_browser_session
+from .session_manager import _is_stale_error_str, get_session as _get_browser_session
 # BrowserSingleton alias kept for any remaining direct uses
 from .tools.browser_singleton import BrowserSingleton
 from .utils.logger import get_logger
@@ -19,6 +27,27 @@ from .utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Number of step records buffered before they are written to MemoryManager
+MEMORY_FLUSH_EVERY = 8
+
+# Pending status messages per executor; further updates are dropped when full
+STATUS_QUEUE_SIZE = 64
+
+# Executor actions that change page state; never run two of these at once
+_PAGE_MUTATING_ACTIONS = frozenset({
+    ActionType.OPEN_URL,
+    ActionType.SEARCH,
+    ActionType.CLICK,
+    ActionType.SCROLL,
+    ActionType.FILL_INPUT,
+    ActionType.NAVIGATE_BACK,
+})
+
+# Cancel event of the Executor.execute() run in the current task context
+_run_cancel: ContextVar[Optional[asyncio.Event]] = ContextVar(
+    "executor_run_cancel", default=None
+)
+
 
 # ============================================================================
 # Helpers
@@ -40,23 +69,176 @@ def extract_steps(plan_json: dict) -> list:
     Returns:
         List of step dicts, or [] if neither key is present.
     """
-    if "final_plan" in plan_json:
-        return plan_json["final_plan"].get("steps", []) or []
-    return plan_json.get("plan", []) or []
+    final_plan = plan_json.get("final_plan")
+    if final_plan is not None:
+        return final_plan.get("steps") or []
+    return plan_json.get("plan") or []
+
+
+class _StatusQueue:
+    """
+    Delivers status messages to a callback from a background task.
+
+    ``put`` never blocks or yields: messages go onto a bounded queue that a
+    drain task feeds to the callback in order, awaiting the result when the
+    callback is async. When the queue is full the message is dropped.
+    ``close`` delivers what is queued and ends the drain task; a later
+    ``put`` starts a new one.
+    """
+
+    def __init__(self, callback: Callable[[str], Any]):
+        self.callback = callback
+        self._queue: "Optional[asyncio.Queue[Optional[str]]]" = None
+        self._task: Optional[asyncio.Task] = None
+
+    def put(self, message: str) -> None:
+        """Queue a status message, or call the callback inline if no loop is running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._deliver_sync(message)
+            return
+        # (Re)start the drain on first use, after close(), or after a
+        # previous loop shut it down
+        if self._queue is None or self._task is None or self._task.done():
+            queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=STATUS_QUEUE_SIZE)
+            self._queue = queue
+            self._task = loop.create_task(self._drain(queue))
+        else:
+            queue = self._queue
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.debug("Status queue full, dropping: %s", message)
+
+    async def close(self) -> None:
+        """Deliver every queued message, then stop the drain task."""
+        queue, task = self._queue, self._task
+        # Detach first so messages put from now on go to a fresh drain
+        self._queue = self._task = None
+        if queue is None or task is None or task.done():
+            return
+        if task.get_loop() is not asyncio.get_running_loop():
+            task.cancel()
+            return
+        await queue.put(None)   # sentinel: everything before it is delivered
+        await task
+
+    async def _drain(self, queue: "asyncio.Queue[Optional[str]]") -> None:
+        while True:
+            message = await queue.get()
+            if message is None:
+                return
+            try:
+                result = self.callback(message)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Status callback failed: {e}")
+
+    def _deliver_sync(self, message: str) -> None:
+        try:
+            result = self.callback(message)
+            if inspect.iscoroutine(result):
+                asyncio.run(result)
+        except Exception as e:
+            logger.warning(f"Status callback failed: {e}")
+
+
+@dataclass(slots=True)
+class _RawGoalStep:
+    """
+    Internal stand-in for GoalStep, built from raw plan dicts.
+
+    Steps from a dict "final_plan" payload are only read by the executor,
+    so they skip pydantic validation; extra keys in the dict are ignored.
+    """
+    step: int
+    action: str
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    description: Optional[str] = None
+    group: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "_RawGoalStep":
+        return cls(
+            step=d.get("step", 1),
+            action=d["action"],
+            parameters=d.get("parameters") or {},
+            description=d.get("description"),
+            group=d.get("group"),
+        )
+
+
+def _group_steps(steps: list) -> List[list]:
+    """
+    Split steps into ordered batches for execution.
+
+    Adjacent steps that share a non-None ``group`` form one batch; every
+    other step is a batch of its own.
+
+    Args:
+        steps: Ordered GoalStep or ActionStep list.
+
+    Returns:
+        List of batches, preserving step order.
+    """
+    batches: List[list] = []
+    for step in steps:
+        if batches and step.group is not None and batches[-1][-1].group == step.group:
+            batches[-1].append(step)
+        else:
+            batches.append([step])
+    return batches
 
 
 class Executor:
     """Executes action plans using browser controller."""
     
-    def __init__(self, browser_controller: BrowserController):
+    def __init__(
+        self,
+        browser_controller: BrowserController,
+        use_context_pool: bool = False,
+        max_retries: int = 1,
+    ):
         """
         Initialize executor.
         
         Args:
             browser_controller: Browser controller instance
+            use_context_pool: Run each plan on its own pooled browser context
+                so concurrent plans don't share a page (plans then don't
+                continue on the page left by the previous plan)
+            max_retries: Retries per failed step; 0 runs steps directly
+                without the retry wrapper
         """
         self.browser = browser_controller
+        self.use_context_pool = use_context_pool
+        self.max_retries = max_retries
         self.status_callback: Optional[Callable[[str], None]] = None
+        self._status_queue: Optional[_StatusQueue] = None
+        # One lock per page, so pooled plans only serialize on their own page
+        self._page_locks: "weakref.WeakKeyDictionary[Page, asyncio.Lock]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._start_lock = asyncio.Lock()
+        
+        # Action → handler table, built once (ActionType is a str enum, so
+        # the plain string actions stored on ActionStep hash to the same keys)
+        self._dispatch: Dict[str, Callable[[Any], Awaitable[str]]] = {
+            ActionType.OPEN_URL: lambda s: self.browser.open_url(s.value),
+            ActionType.SEARCH: lambda s: self.browser.search(s.value),
+            ActionType.CLICK: self._do_click,
+            ActionType.SCROLL: self._do_scroll,
+            ActionType.EXTRACT_TEXT: self._do_extract_text,
+            ActionType.FILL_INPUT: lambda s: self.browser.fill_input(s.selector, s.value),
+            ActionType.WAIT: lambda s: self.browser.wait(s.duration_ms or 1000),
+            ActionType.NAVIGATE_BACK: lambda s: self.browser.navigate_back(),
+        }
+        # Page-mutating handlers take their page's lock themselves, so a step
+        # dispatch is a single lookup with no per-step membership test
+        for action in _PAGE_MUTATING_ACTIONS:
+            self._dispatch[action] = self._with_page_lock(self._dispatch[action])
         
         logger.info("Executor initialized")
     
@@ -65,51 +247,117 @@ class Executor:
         Set callback for status updates.
         
         Args:
-            callback: Function to call with status messages
+            callback: Function to call with status messages; may be
+                async. Runs from a background task, not inline with steps.
         """
         self.status_callback = callback
+        self._status_queue = _StatusQueue(callback) if callback else None
     
-    async def execute(self, plan: ActionPlan) -> str:
+    async def execute(
+        self, plan: ActionPlan, cancel_event: Optional[asyncio.Event] = None
+    ) -> str:
         """
-        Execute action plan sequentially.
+        Execute action plan in order.
+        
+        Adjacent steps sharing a ``group`` are run together with
+        ``asyncio.gather``; page-mutating actions inside a group still
+        take turns on the page.
         
         Args:
             plan: ActionPlan to execute
+            cancel_event: Set it to stop this run: no further steps start
+                and retry waits end early. Other runs are unaffected.
             
         Returns:
             Final status message
         """
         logger.info(f"Starting execution of plan with {len(plan.steps)} steps")
+        cancel = cancel_event if cancel_event is not None else asyncio.Event()
+        token = _run_cancel.set(cancel)
         
-        results = []
-        
-        for idx, step in enumerate(plan.steps, 1):
-            try:
-                logger.info(f"Executing step {idx}: {step.action}")
-                
-                # Send status update
-                if step.description:
-                    await self._send_status(f"Step {idx}: {step.description}...")
-                else:
-                    await self._send_status(f"Executing {step.action}...")
-                
-                # Execute action with retry
-                result = await self._execute_step_with_retry(step)
-                results.append(result)
-                
-                logger.info(f"Step {idx} completed: {result}")
-                
-            except Exception as e:
-                logger.error(f"Step {idx} failed: {e}")
-                error_msg = f"Step {idx} failed: {str(e)}"
-                await self._send_status(error_msg)
-                results.append(error_msg)
+        try:
+            if self.use_context_pool:
+                async with self.browser.lease_page():
+                    successes, total = await self._run_plan(plan)
+            else:
+                successes, total = await self._run_plan(plan)
+        finally:
+            _run_cancel.reset(token)
+            await self._flush_status()
         
-        final_message = self._build_final_message(results)
+        if cancel.is_set():
+            final_message = f"Execution cancelled after {total} step(s)."
+        else:
+            final_message = self._build_final_message(successes, total)
         logger.info(f"Execution complete. Message: {final_message}")
         
         return final_message
     
+    async def _run_plan(self, plan: ActionPlan) -> Tuple[int, int]:
+        """
+        Run every step of a plan, honouring step groups.
+        
+        Args:
+            plan: ActionPlan to execute
+            
+        Returns:
+            (successful steps, total steps)
+        """
+        # Only the tally is kept; per-step messages are already logged/sent
+        successes = 0
+        idx = 0
+        
+        for batch in _group_steps(plan.steps):
+            if self._cancelled():
+                logger.info(f"Plan cancelled after {idx} step(s)")
+                break
+            first = idx + 1
+            idx += len(batch)
+            if len(batch) == 1:
+                outcomes = [await self._run_step(first, batch[0])]
+            else:
+                outcomes = await asyncio.gather(
+                    *(self._run_step(first + i, step) for i, step in enumerate(batch))
+                )
+            successes += sum(ok for ok, _ in outcomes)
+        
+        return successes, idx
+    
+    async def _run_step(self, idx: int, step) -> Tuple[bool, str]:
+        """
+        Run one plan step with status updates; never raises.
+        
+        Args:
+            idx: 1-based step number
+            step: ActionStep to execute
+            
+        Returns:
+            (succeeded, result or error message)
+        """
+        try:
+            logger.info(f"Executing step {idx}: {step.action}")
+            
+            # Send status update
+            if step.description:
+                self._send_status(f"Step {idx}: {step.description}...")
+            else:
+                self._send_status(f"Executing {step.action}...")
+            
+            # Execute action, with retry unless retries are disabled
+            if self.max_retries:
+                result = await self._execute_step_with_retry(step, self.max_retries)
+            else:
+                result = await self._execute_step(step)
+            
+            logger.info(f"Step {idx} completed: {result}")
+            return True, result or ""
+            
+        except Exception as e:
+            logger.error(f"Step {idx} failed: {e}")
+            error_msg = f"Step {idx} failed: {str(e)}"
+            self._send_status(error_msg)
+            return False, error_msg
+    
     async def _execute_step_with_retry(self, step, max_retries: int = 1):
         """
         Execute a step with retry logic.
@@ -122,31 +370,56 @@ class Executor:
             Result message
         """
         for attempt in range(max_retries + 1):
-            t0 = time.monotonic()
+            t0 = time.perf_counter_ns()
             try:
                 result = await self._execute_step(step)
-                duration_ms = int((time.monotonic() - t0) * 1000)
-                logger.info(
-                    f"[Executor] action={step.action} | "
-                    f"status=success | duration_ms={duration_ms} | "
-                    f"result={str(result)[:80]!r}"
-                )
+                duration_ms = (time.perf_counter_ns() - t0) // 1_000_000
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "[Executor] action=%s | status=success | duration_ms=%d | result=%r",
+                        step.action, duration_ms, str(result)[:80]
+                    )
                 return result
             except asyncio.TimeoutError:
                 if attempt < max_retries:
-                    logger.warning(f"Timeout, retrying step (attempt {attempt + 2})")
-                    await self._send_status(f"Retrying action...")
-                    await asyncio.sleep(2)
+                    logger.warning("Timeout, retrying step (attempt %d)", attempt + 2)
+                    self._send_status(f"Retrying action...")
+                    if await self._cancelled_within(2):
+                        raise
                 else:
                     raise
             except Exception as e:
                 if attempt < max_retries:
-                    logger.warning(f"Step failed: {e}, retrying (attempt {attempt + 2})")
-                    await self._send_status(f"Retrying action...")
-                    await asyncio.sleep(1)
+                    logger.warning("Step failed: %s, retrying (attempt %d)", e, attempt + 2)
+                    self._send_status(f"Retrying action...")
+                    if await self._cancelled_within(1):
+                        raise
                 else:
                     raise
     
+    @staticmethod
+    def _cancelled() -> bool:
+        """True if the current run's cancel event is set."""
+        cancel = _run_cancel.get()
+        return cancel is not None and cancel.is_set()
+    
+    async def _cancelled_within(self, delay: float) -> bool:
+        """
+        Wait up to ``delay`` seconds before a retry, waking early on cancel.
+        
+        Returns:
+            True if the plan was cancelled (the retry should be skipped)
+        """
+        cancel = _run_cancel.get()
+        if cancel is None:
+            await asyncio.sleep(delay)
+            return False
+        try:
+            await asyncio.wait_for(cancel.wait(), timeout=delay)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
     async def _execute_step(self, step) -> str:
         """
         Execute a single action step.
@@ -157,72 +430,91 @@ class Executor:
         Returns:
             Result message
         """
-        action = step.action
-        
-        if action == ActionType.OPEN_URL:
-            return await self.browser.open_url(step.value)
-        
-        elif action == ActionType.SEARCH:
-            return await self.browser.search(step.value)
-        
-        elif action == ActionType.CLICK:
-            # Special case for click_first_result
-            if step.value == "click_first_result":
-                return await self.browser.click_first_result()
-            else:
-                return await self.browser.click(step.selector or step.value)
-        
-        elif action == ActionType.SCROLL:
-            direction = step.value or "down"
-            amount = step.duration_ms or 3 if step.duration_ms else 3
-            return await self.browser.scroll(direction, amount)
-        
-        elif action == ActionType.EXTRACT_TEXT:
-            text = await self.browser.extract_text(step.selector)
-            return f"Extracted text: {text[:200]}..." if len(text) > 200 else f"Extracted text: {text}"
-        
-        elif action == ActionType.FILL_INPUT:
-            return await self.browser.fill_input(step.selector, step.value)
-        
-        elif action == ActionType.WAIT:
-            return await self.browser.wait(step.duration_ms or 1000)
-        
-        elif action == ActionType.NAVIGATE_BACK:
-            return await self.browser.navigate_back()
+        handler = self._dispatch.get(step.action)
+        if handler is None:
+            raise ValueError(f"Unknown action: {step.action}")
+        return await handler(step)
+    
+    def _with_page_lock(
+        self, handler: Callable[[Any], Awaitable[str]]
+    ) -> Callable[[Any], Awaitable[str]]:
+        """Wrap a dispatch handler so it runs under the current page's lock."""
+        async def locked(step) -> str:
+            async with await self._lock_for_page():
+                return await handler(step)
+        return locked
+    
+    async def _lock_for_page(self) -> asyncio.Lock:
+        """
+        Return the lock for the page this task's actions run on.
         
-        else:
-            raise ValueError(f"Unknown action: {action}")
+        The page is the leased one inside lease_page(), else the shared
+        default page; the browser is started first if it has no page yet.
+        """
+        page = self.browser.page
+        if page is None:
+            async with self._start_lock:
+                await self.browser.ensure_started()
+            page = self.browser.page
+            if page is None:
+                raise RuntimeError("Browser not started. Call start() first.")
+        lock = self._page_locks.get(page)
+        if lock is None:
+            lock = self._page_locks[page] = asyncio.Lock()
+        return lock
+    
+    async def _do_click(self, step) -> str:
+        """Click an element, with a special case for click_first_result."""
+        if step.value == "click_first_result":
+            return await self.browser.click_first_result()
+        return await self.browser.click(step.selector or step.value)
+    
+    async def _do_scroll(self, step) -> str:
+        """Scroll the page (default: down by 3)."""
+        direction = step.value or "down"
+        amount = step.duration_ms or 3 if step.duration_ms else 3
+        return await self.browser.scroll(direction, amount)
+    
+    async def _do_extract_text(self, step) -> str:
+        """Extract a short text preview from the page or an element."""
+        # One extra char tells us whether the text was truncated
+        text = await self.browser.extract_text(step.selector, max_chars=201)
+        return f"Extracted text: {text[:200]}..." if len(text) > 200 else f"Extracted text: {text}"
     
-    async def _send_status(self, message: str) -> None:
+    def _send_status(self, message: str) -> None:
         """
         Send status update via callback.
         
         Args:
             message: Status message
         """
-        if self.status_callback:
-            self.status_callback(message)
+        if self._status_queue:
+            self._status_queue.put(message)
         else:
             logger.info(f"Status: {message}")
     
-    def _build_final_message(self, results: List[str]) -> str:
+    async def _flush_status(self) -> None:
+        """Deliver pending status messages and stop the status drain task."""
+        if self._status_queue:
+            await self._status_queue.close()
+    
+    def _build_final_message(self, successes: int, total: int) -> str:
         """
-        Build final completion message from results.
+        Build final completion message from the step tally.
         
         Args:
-            results: List of action results
+            successes: Number of steps that succeeded
+            total: Number of steps run
             
         Returns:
             Final message
         """
-        # Count successes and failures
-        successes = sum(1 for r in results if not r.startswith("Step") or "failed" not in r)
-        failures = len(results) - successes
+        failures = total - successes
         
         if failures == 0:
-            return f"✓ All {len(results)} steps completed successfully!"
-        elif failures < len(results):
-            return f"⚠ Completed {successes}/{len(results)} steps. {failures} step(s) encountered issues."
+            return f"✓ All {total} steps completed successfully!"
+        elif failures < total:
+            return f"⚠ Completed {successes}/{total} steps. {failures} step(s) encountered issues."
         else:
             return f"✗ All steps failed. Please check the execution logs."
 
@@ -255,19 +547,25 @@ class AutonomousGoalExecutor:
         self.registry = tool_registry
         self.memory = memory_manager
         self.status_callback: Optional[Callable[[str], None]] = None
+        self._status_queue: Optional[_StatusQueue] = None
         logger.info("[AutonomousGoalExecutor] Initialized")
 
     def set_status_callback(self, callback: Callable[[str], None]) -> None:
         self.status_callback = callback
+        self._status_queue = _StatusQueue(callback) if callback else None
 
     async def execute_plan(self, plan: GoalPlan) -> List[dict]:
         """
-        Execute all steps in a GoalPlan sequentially.
+        Execute all steps in a GoalPlan in order.
 
         Supports both new deliberative format (final_plan.steps) and legacy
         format (plan). Step extraction is performed via the module-level
         ``extract_steps`` helper for uniform dual-format handling.
 
+        Adjacent steps that share a ``group`` are independent and are
+        dispatched together with ``asyncio.gather``; all other steps run
+        one at a time. Results are always returned in step order.
+
         Args:
             plan: GoalPlan produced by GoalPlanner
 
@@ -278,37 +576,62 @@ class AutonomousGoalExecutor:
         results = []
 
         # ── Universal step extraction (handles final_plan.steps OR plan) ────
-        plan_dict  = plan.model_dump()
-        raw_steps  = extract_steps(plan_dict)
+        # GoalPlan.plan is already typed, so only an extra "final_plan" payload
+        # needs the dict-based helper; no full model_dump() of the plan.
+        final_plan = getattr(plan, "final_plan", None)
+        if final_plan is not None:
+            if not isinstance(final_plan, dict):
+                final_plan = final_plan.model_dump(mode="python", exclude_unset=True)
+            raw_steps = extract_steps({"final_plan": final_plan})
+        else:
+            raw_steps = plan.plan
         goal_steps = [
-            GoalStep(**s) if isinstance(s, dict) else s
+            _RawGoalStep.from_dict(s) if isinstance(s, dict) else s
             for s in raw_steps
         ]
 
         logger.info(
-            f"[AutonomousGoalExecutor] Executing plan: {len(goal_steps)} steps | "
-            f"mode={plan.mode} | goal={plan.goal[:60]!r}"
+            "[AutonomousGoalExecutor] Executing plan: %d steps | mode=%s | goal=%r",
+            len(goal_steps), plan.mode, plan.goal[:60]
         )
 
-        for step in goal_steps:
-            step_result = await self._execute_step(step)
-            results.append(step_result)
-
-            # Record in memory if available
-            if self.memory:
-                self.memory.add_step(
-                    step_number=step.step,
-                    action=step.action,
-                    parameters=step.parameters,
-                    result=step_result["result"],
-                    success=step_result["success"],
-                    duration_ms=step_result["duration_ms"],
-                    error=step_result.get("error"),
-                )
+        # Step records are flushed to memory in batches rather than one by one
+        memory = self.memory
+        memory_batch: List[dict] = []
+        try:
+            for batch in _group_steps(goal_steps):
+                if len(batch) == 1:
+                    batch_results = [await self._execute_step(batch[0])]
+                else:
+                    batch_results = await asyncio.gather(
+                        *(self._execute_step(step) for step in batch)
+                    )
+
+                for step, step_result in zip(batch, batch_results):
+                    results.append(step_result)
+
+                    if memory is not None:
+                        memory_batch.append({
+                            "step_number": step.step,
+                            "action": step.action,
+                            "parameters": step.parameters,
+                            "result": step_result["result"],
+                            "success": step_result["success"],
+                            "duration_ms": step_result["duration_ms"],
+                            "error": step_result.get("error"),
+                        })
+
+                if memory is not None and len(memory_batch) >= MEMORY_FLUSH_EVERY:
+                    memory.add_steps(memory_batch)
+                    memory_batch = []
+        finally:
+            if memory is not None and memory_batch:
+                memory.add_steps(memory_batch)
+            await self._flush_status()
 
         return results
 
-    async def _execute_step(self, step: GoalStep) -> dict:
+    async def _execute_step(self, step: Union[GoalStep, _RawGoalStep]) -> dict:
         """
         Execute a single GoalStep with automatic stale-browser recovery.
 
@@ -319,17 +642,20 @@ class AutonomousGoalExecutor:
                b. Retry the step ONCE
           3. Return structured result dict.
         """
+        # Resolve model attributes once; everything below uses the locals
         action = step.action
         params = step.parameters or {}
+        step_no = step.step
+        desc = step.description or action
 
-        await self._send_status(f"Step {step.step}: {step.description or action}...")
-        logger.info(f"[TOOL] Executing: {action} | params={params}")
+        self._send_status(f"Step {step_no}: {desc}...")
+        logger.info("[TOOL] Executing: %s | params=%s", action, params)
 
-        async def _run_once() -> dict:
-            t0 = time.monotonic()
+        async def _run_once() -> tuple:
+            t0 = time.perf_counter_ns()
             tool_result = await self.registry.execute(action, params)
-            duration_ms = int((time.monotonic() - t0) * 1000)
-            logger.info(f"[TOOL RESULT] step={step.step} action={action} | {tool_result}")
+            duration_ms = (time.perf_counter_ns() - t0) // 1_000_000
+            logger.info("[TOOL RESULT] step=%s action=%s | %s", step_no, action, tool_result)
             return tool_result, duration_ms
 
         tool_result, duration_ms = await _run_once()
@@ -339,18 +665,19 @@ class AutonomousGoalExecutor:
             isinstance(tool_result, dict)
             and tool_result.get("status") == "error"
             and tool_result.get("error")
-            and _is_stale_error(Exception(tool_result["error"]))
+            and _is_stale_error_str(tool_result["error"])
         ):
             logger.warning(
-                f"[AutonomousGoalExecutor] Stale browser detected on step={step.step} "
-                f"action={action} — resetting browser and retrying..."
+                "[AutonomousGoalExecutor] Stale browser detected on step=%s "
+                "action=%s — resetting browser and retrying...",
+                step_no, action
             )
             try:
                 await _get_browser_session().reset()   # session_manager.reset()
-                logger.info(f"[AutonomousGoalExecutor] Browser reset OK, retrying step={step.step}")
+                logger.info("[AutonomousGoalExecutor] Browser reset OK, retrying step=%s", step_no)
                 tool_result, duration_ms = await _run_once()
             except Exception as reset_err:
-                logger.error(f"[AutonomousGoalExecutor] Browser reset failed: {reset_err}")
+                logger.error("[AutonomousGoalExecutor] Browser reset failed: %s", reset_err)
                 # Keep original error result — don't mask the reset failure
         # ───────────────────────────────────────────────────────────────────
 
@@ -365,12 +692,14 @@ class AutonomousGoalExecutor:
             else:
                 result_str = f"{action} completed successfully"
 
-            logger.info(
-                f"[AutonomousGoalExecutor] step={step.step} action={action} | "
-                f"status=SUCCESS | duration_ms={duration_ms} | result={result_str[:80]!r}"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "[AutonomousGoalExecutor] step=%s action=%s | "
+                    "status=SUCCESS | duration_ms=%d | result=%r",
+                    step_no, action, duration_ms, result_str[:80]
+                )
             return {
-                "step": step.step,
+                "step": step_no,
                 "action": action,
                 "parameters": params,
                 "success": True,
@@ -385,11 +714,12 @@ class AutonomousGoalExecutor:
                 else str(tool_result)
             )
             logger.error(
-                f"[AutonomousGoalExecutor] step={step.step} action={action} | "
-                f"status=FAILED | duration_ms={duration_ms} | error={error_msg}"
+                "[AutonomousGoalExecutor] step=%s action=%s | "
+                "status=FAILED | duration_ms=%d | error=%s",
+                step_no, action, duration_ms, error_msg
             )
             return {
-                "step": step.step,
+                "step": step_no,
                 "action": action,
                 "parameters": params,
                 "success": False,
@@ -399,9 +729,14 @@ class AutonomousGoalExecutor:
                 "error": error_msg,
             }
 
-    async def _send_status(self, message: str) -> None:
+    def _send_status(self, message: str) -> None:
         """Send status update via callback."""
-        if self.status_callback:
-            self.status_callback(message)
+        if self._status_queue:
+            self._status_queue.put(message)
         else:
             logger.info(f"[AutonomousGoalExecutor] Status: {message}")
+
+    async def _flush_status(self) -> None:
+        """Deliver pending status messages and stop the status drain task."""
+        if self._status_queue:
+            await self._status_queue.close()
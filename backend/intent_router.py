@@ -15,13 +15,17 @@ class IntentRouter:
     """Routes user messages to appropriate handler based on intent."""
     
     # Action keywords that indicate browser automation request
-    AUTOMATION_KEYWORDS = {
+    AUTOMATION_KEYWORDS = frozenset({
         "open", "visit", "go to", "navigate", "search", "find", "look for",
         "click", "press", "scroll", "extract", "read", "get", "fetch",
         "type", "enter", "fill", "submit", "screenshot", "capture",
         "download", "upload", "drag", "drop", "hover", "wait for",
         "load", "browse", "check", "verify", "follow", "access", "reach"
-    }
+    })
+    # Split for whole-word matching: single words against the message's
+    # words, two-word phrases against its adjacent word pairs
+    _KEYWORD_WORDS = frozenset(k for k in AUTOMATION_KEYWORDS if " " not in k)
+    _KEYWORD_PHRASES = frozenset(k for k in AUTOMATION_KEYWORDS if " " in k)
     
     # Patterns that match automation requests
     AUTOMATION_PATTERNS = [
@@ -34,6 +38,20 @@ class IntentRouter:
         r"(?:can you|please|pls)?\s*(?:open|search|find|click|scroll|browse|check|extract)",
     ]
     
+    # Compiled once: any single pattern match scores the same, so one
+    # alternation replaces the per-pattern search loop
+    _AUTOMATION_RE = re.compile(
+        "|".join(f"(?:{pattern})" for pattern in AUTOMATION_PATTERNS),
+        re.IGNORECASE
+    )
+    _URL_RE = re.compile(r'(?:https?://|www\.|\.com|\.org|\.net)', re.IGNORECASE)
+    # Message tokens for keyword matching; punctuation is dropped so
+    # "search, please" or "open it." still match their keyword
+    _WORD_RE = re.compile(r"[a-z][a-z_]*")
+    
+    # Scores above this are routed to automation
+    AUTOMATION_THRESHOLD = 0.3
+    
     def __init__(self):
         """Initialize intent router."""
         logger.info("IntentRouter initialized")
@@ -53,7 +71,7 @@ class IntentRouter:
         # Check for automation patterns
         confidence = self._calculate_confidence(message_lower)
         
-        if confidence > 0.3:
+        if confidence > self.AUTOMATION_THRESHOLD:
             intent = IntentType.AUTOMATION
         else:
             intent = IntentType.CHAT
@@ -69,6 +87,10 @@ class IntentRouter:
         """
         Calculate confidence that message is automation request.
         
+        Checks run cheapest first and stop as soon as the score passes
+        AUTOMATION_THRESHOLD, so for automation requests the returned
+        score is a lower bound rather than the full sum.
+        
         Args:
             message: Lowercase message text
             
@@ -77,28 +99,29 @@ class IntentRouter:
         """
         score = 0.0
         
-        # Check for automation keywords
-        keyword_matches = sum(
-            1 for keyword in self.AUTOMATION_KEYWORDS
-            if f" {keyword} " in f" {message} "
-        )
-        keyword_score = min(keyword_matches * 0.15, 0.6)
-        score += keyword_score
-        
         # Check for URL patterns
         if self._contains_url_pattern(message):
             score += 0.2
         
+        # Check for automation keywords (each distinct keyword counts once)
+        words = self._WORD_RE.findall(message)
+        keyword_matches = len(self._KEYWORD_WORDS.intersection(words))
+        if len(words) > 1:
+            keyword_matches += len(self._KEYWORD_PHRASES.intersection(
+                map(" ".join, zip(words, words[1:]))
+            ))
+        keyword_score = min(keyword_matches * 0.15, 0.6)
+        score += keyword_score
+        if score > self.AUTOMATION_THRESHOLD:
+            return min(score, 1.0)
+        
         # Check for regex patterns
-        for pattern in self.AUTOMATION_PATTERNS:
-            if re.search(pattern, message, re.IGNORECASE):
-                score += 0.3
-                break
+        if self._AUTOMATION_RE.search(message):
+            score += 0.3
         
         # Normalize score
         return min(score, 1.0)
     
     def _contains_url_pattern(self, message: str) -> bool:
         """Check if message contains URL patterns."""
-        url_pattern = r'(?:https?://|www\.|\.com|\.org|\.net)'
-        return bool(re.search(url_pattern, message, re.IGNORECASE))
+        return self._URL_RE.search(message) is not None
@@ -2,51 +2,142 @@
 LLM Client for LM Studio (OpenAI-compatible API).
 
 CPU-optimised for local Mixtral inference:
-  - httpx.AsyncClient (async) + httpx.Client (sync)
+  - httpx.AsyncClient (async) + httpx.Client (sync) from backend/_http.py,
+    pooled and shared with every other outbound caller
   - 180 second timeout — required for CPU inference
-  - 2 retries with exponential backoff
+  - 2 retries; exponential backoff on timeouts, jittered otherwise
   - LRU cache (50 entries) avoids re-running identical prompts
+  - Identical concurrent async calls share one in-flight request
   - NO stream field in payload — causes 400 on Mixtral/LM Studio
+    (stream_response() opts in with stream=True for token streaming,
+    serving cache hits without a request)
+  - Optional LLM_DRAFT_MODEL forwarded as "draft_model" (speculative decoding)
   - Structured logging: model, latency, errors with stack traces
   - Never raises to callers — always returns string (text or fallback)
 """
 
-import os
 import time
 import json
+import random
 import asyncio
+import logging
 import hashlib
+import threading
 import traceback
-from typing import Optional, List, Dict, Any
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, AsyncGenerator
 
 import httpx
 from dotenv import load_dotenv
+from . import _http
 from .utils.logger import get_logger
 
 load_dotenv()
+from .config import settings  # after load_dotenv so .env values are visible
 logger = get_logger(__name__)
 
+# ---------------------------------------------------------------------------
+# JSON codec — orjson (bytes in/out) when installed, stdlib json otherwise
+# ---------------------------------------------------------------------------
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+    # orjson>=3.9 embeds pre-encoded JSON verbatim via Fragment
+    _Fragment = getattr(orjson, "Fragment", None)
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode()
+
+    _json_loads = json.loads
+    _Fragment = None
+
+
+def _prencoded(encoded: bytes, obj: Any) -> Any:
+    """Stand-in for ``obj`` inside a payload, reusing its JSON bytes when possible."""
+    return _Fragment(encoded) if _Fragment is not None else obj
+
 # ---------------------------------------------------------------------------
 # LRU response cache (size 50) — avoids repeating slow CPU inference
 # ---------------------------------------------------------------------------
-_CACHE: Dict[str, str] = {}
-_CACHE_KEYS: List[str] = []
+_CACHE: "OrderedDict[int, str]" = OrderedDict()
 _CACHE_MAX = 50
+# Guards _CACHE for both paths; sync calls may run in worker threads
+_CACHE_LOCK = threading.Lock()
+
+# Cache keys are a 64-bit hash of the model, temperature and the encoded
+# messages (the same bytes that go into the request body).
+# xxhash is optional; blake2b is the fallback.
+try:
+    import xxhash
+    _hash64 = xxhash.xxh3_64_intdigest
+except ImportError:
+    def _hash64(data: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+def _cache_get(key: int) -> Optional[str]:
+    with _CACHE_LOCK:
+        value = _CACHE.get(key)
+        if value is not None:
+            _CACHE.move_to_end(key)
+        return value
+
+def _cache_put(key: int, value: str) -> None:
+    with _CACHE_LOCK:
+        _CACHE[key] = value
+        _CACHE.move_to_end(key)
+        if len(_CACHE) > _CACHE_MAX:
+            _CACHE.popitem(last=False)
+
+def _cache_key(
+    model: str,
+    messages_json: bytes,
+    temperature: float,
+    max_tokens: int,
+    stop: Optional[List[str]],
+) -> int:
+    # Token budget and stop sequences shape the reply, so they are part of the key
+    return _hash64(
+        f"{model}|{temperature!r}|{max_tokens}|{tuple(stop or ())!r}|".encode() + messages_json
+    )
 
-def _cache_get(key: str) -> Optional[str]:
-    return _CACHE.get(key)
 
-def _cache_put(key: str, value: str) -> None:
-    if key in _CACHE:
-        _CACHE_KEYS.remove(key)
-    elif len(_CACHE_KEYS) >= _CACHE_MAX:
-        _CACHE.pop(_CACHE_KEYS.pop(0), None)
-    _CACHE[key] = value
-    _CACHE_KEYS.append(key)
+# Async requests currently in flight, by cache key (which covers the
+# token budget and stop sequences). Identical concurrent calls await the
+# same task instead of re-running inference.
+_INFLIGHT: Dict[int, "asyncio.Task[str]"] = {}
 
-def _cache_key(model: str, messages: List[Dict], temperature: float) -> str:
-    raw = json.dumps({"m": model, "msgs": messages, "t": temperature}, sort_keys=True)
-    return hashlib.md5(raw.encode()).hexdigest()
+
+def _retry_delay(attempt: int, error: Optional[BaseException]) -> float:
+    """
+    Seconds to wait before the next attempt.
+
+    Timeouts mean the model is busy, so they keep the 2 s+ exponential wait.
+    5xx responses retry immediately (LM Studio races usually clear at once).
+    Anything else uses full-jitter backoff from a 100 ms base so concurrent
+    callers don't retry in lockstep.
+    """
+    if isinstance(error, httpx.TimeoutException):
+        return max(2, 2 ** (attempt - 1))
+    if isinstance(error, httpx.HTTPStatusError):
+        status_error: httpx.HTTPStatusError = error
+        if status_error.response.status_code >= 500:
+            return 0.0
+    return random.uniform(0, min(8.0, 0.1 * 2 ** (attempt - 1)))
+
+
+def _parse_sse_delta(line: str) -> Optional[str]:
+    """Return the content delta of one SSE line, or None if it carries none."""
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    if not data or data == "[DONE]":
+        return None
+    try:
+        return _json_loads(data)["choices"][0]["delta"].get("content")
+    except (json.JSONDecodeError, KeyError, IndexError, TypeError):
+        return None
 
 
 class LLMClient:
@@ -71,12 +162,14 @@ class LLMClient:
         model:    Optional[str] = None,
         timeout:  Optional[int] = None,
     ):
-        self.base_url   = (base_url or os.getenv("LLM_BASE_URL", "http://localhost:1234/v1")).rstrip("/")
-        self.model      = model   or os.getenv("LLM_MODEL",    "phi-3.1-mini-4k-instruct")
-        self.timeout    = int(timeout or os.getenv("LLM_TIMEOUT",    120))
-        self.max_tokens = int(os.getenv("LLM_MAX_TOKENS", 256))
-        self.temperature = float(os.getenv("LLM_TEMPERATURE", 0.7))
+        # Defaults come from backend/config.py — the single source of truth
+        self.base_url   = (base_url or settings.LLM_BASE_URL).rstrip("/")
+        self.model      = model   or settings.LLM_MODEL
+        self.timeout    = int(timeout or settings.LLM_TIMEOUT)
+        self.max_tokens = settings.LLM_MAX_TOKENS
+        self.temperature = settings.LLM_TEMPERATURE
         self.max_retries = 2
+        self.draft_model = settings.LLM_DRAFT_MODEL or None
 
         self._chat_url   = f"{self.base_url}/chat/completions"
         self._models_url = f"{self.base_url}/models"
@@ -106,14 +199,39 @@ class LLMClient:
         out.append({"role": "user", "content": prompt})
         return out
 
-    def _payload(self, messages: List[Dict], temperature: float, max_tokens: int) -> Dict:
+    def _payload(
+        self,
+        messages: Any,
+        temperature: float,
+        max_tokens: int,
+        stop: Optional[List[str]] = None,
+    ) -> Dict:
         # NOTE: "stream" key intentionally omitted — LM Studio returns 400 with stream=False on some models
-        return {
+        payload = {
             "model":       self.model,
             "messages":    messages,
             "temperature": temperature,
             "max_tokens":  max_tokens,
         }
+        if stop:
+            payload["stop"] = stop
+        if self.draft_model:
+            payload["draft_model"] = self.draft_model
+        return payload
+
+    # Connections come from the process-wide pools in backend/_http.py
+    _get_http = staticmethod(_http.get_async_client)
+    _get_http_sync = staticmethod(_http.get_sync_client)
+
+    @staticmethod
+    def close() -> None:
+        """Close the shared sync Client."""
+        _http.close()
+
+    @staticmethod
+    async def aclose() -> None:
+        """Close the shared clients (call once at server shutdown)."""
+        await _http.aclose()
 
     def _parse(self, result: Dict) -> str:
         try:
@@ -132,23 +250,50 @@ class LLMClient:
         messages:      Optional[List[Dict[str,str]]] = None,
         temperature:   Optional[float]            = None,
         max_tokens:    Optional[int]              = None,
+        stop:          Optional[List[str]]        = None,
+        coalesce:      bool                       = True,
     ) -> str:
         """
         Async LLM call. Returns text or FALLBACK — never raises.
         Accepts messages=[...] or prompt=/system_prompt= (legacy).
+        Optional stop sequences end decoding early. coalesce=False always
+        sends a new request instead of joining an identical one in flight
+        (e.g. for a hedged duplicate).
         """
         temp      = temperature if temperature is not None else self.temperature
         max_tok   = max_tokens  if max_tokens  is not None else self.max_tokens
         msgs      = self._make_messages(prompt, system_prompt, messages)
-        key       = _cache_key(self.model, msgs, temp)
+        msgs_json = _json_dumps(msgs)   # encoded once: cache key + request body
+        key       = _cache_key(self.model, msgs_json, temp, max_tok, stop)
 
         hit = _cache_get(key)
         if hit:
             logger.info("[LLMClient] Cache hit (async)")
             return hit
 
-        payload     = self._payload(msgs, temp, max_tok)
-        last_error  = None
+        if not coalesce:
+            payload = self._payload(_prencoded(msgs_json, msgs), temp, max_tok, stop)
+            return await self._request(key, _json_dumps(payload))
+
+        task = _INFLIGHT.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            logger.info("[LLMClient] Joining in-flight request (async)")
+        else:
+            payload = self._payload(_prencoded(msgs_json, msgs), temp, max_tok, stop)
+            task = asyncio.create_task(self._request(key, _json_dumps(payload)))
+            _INFLIGHT[key] = task
+            task.add_done_callback(
+                lambda t: _INFLIGHT.pop(key) if _INFLIGHT.get(key) is t else None
+            )
+        # Shielded: one caller being cancelled must not cancel the others
+        return await asyncio.shield(task)
+
+    async def _request(self, key: int, body: bytes) -> str:
+        """
+        POST an encoded chat request with retries; caches and returns the text.
+        Returns an LLM_ERROR string when every attempt fails — never raises.
+        """
+        last_error = None
 
         for attempt in range(1, self.max_retries + 1):
             t0 = time.monotonic()
@@ -157,16 +302,20 @@ class LLMClient:
                     f"[LLMClient] Async attempt {attempt}/{self.max_retries} "
                     f"-> POST {self._chat_url} (timeout={self.timeout}s)"
                 )
-                logger.debug(f"[LLMClient] Payload: {json.dumps(payload, ensure_ascii=False)[:300]}")
-
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    resp = await client.post(
-                        self._chat_url,
-                        json=payload,
-                        headers={"Content-Type": "application/json"},
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "[LLMClient] Payload: %s",
+                        body[:300].decode(errors="ignore"),
                     )
-                    resp.raise_for_status()
-                    data = resp.json()
+
+                resp = await self._get_http().post(
+                    self._chat_url,
+                    content=body,
+                    headers={"Content-Type": "application/json"},
+                    timeout=self.timeout,
+                )
+                resp.raise_for_status()
+                data = _json_loads(resp.content)
 
                 latency = time.monotonic() - t0
                 text    = self._parse(data)
@@ -206,13 +355,76 @@ class LLMClient:
                 logger.debug(traceback.format_exc())
 
             if attempt < self.max_retries:
-                wait = max(2, 2 ** (attempt - 1))
-                logger.info(f"[LLMClient] Retrying in {wait}s...")
-                await asyncio.sleep(wait)
+                wait = _retry_delay(attempt, last_error)
+                logger.info(f"[LLMClient] Retrying in {wait:.2f}s...")
+                if wait:
+                    await asyncio.sleep(wait)
 
         logger.error(f"[LLMClient] All async attempts failed. Last: {last_error}")
         return f"LLM_ERROR: {type(last_error).__name__}: {last_error}"
 
+    async def stream_response(
+        self,
+        prompt:        Optional[str]              = None,
+        system_prompt: Optional[str]              = None,
+        messages:      Optional[List[Dict[str,str]]] = None,
+        temperature:   Optional[float]            = None,
+        max_tokens:    Optional[int]              = None,
+        stop:          Optional[List[str]]        = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Async token streaming (stream=True, SSE). Yields content deltas.
+
+        Shares the response cache with generate_response: a hit is yielded
+        as one chunk without a request, and a stream consumed to the end
+        is cached. Unlike generate_response it is not retried, and it DOES
+        raise (httpx errors) — once tokens are delivered a retry can't be
+        transparent, so the caller decides how to fall back.
+        """
+        temp    = temperature if temperature is not None else self.temperature
+        max_tok = max_tokens  if max_tokens  is not None else self.max_tokens
+        msgs    = self._make_messages(prompt, system_prompt, messages)
+        msgs_json = _json_dumps(msgs)   # encoded once: cache key + request body
+        key     = _cache_key(self.model, msgs_json, temp, max_tok, stop)
+
+        hit = _cache_get(key)
+        if hit:
+            logger.info("[LLMClient] Cache hit (stream)")
+            yield hit
+            return
+
+        payload = self._payload(_prencoded(msgs_json, msgs), temp, max_tok, stop)
+        payload["stream"] = True
+
+        t0 = time.monotonic()
+        chars = 0
+        parts: List[str] = []
+        logger.info(f"[LLMClient] Stream -> POST {self._chat_url} (timeout={self.timeout}s)")
+
+        async with self._get_http().stream(
+            "POST",
+            self._chat_url,
+            content=_json_dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout,
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                delta = _parse_sse_delta(line)
+                if delta:
+                    chars += len(delta)
+                    parts.append(delta)
+                    yield delta
+
+        # Only reached when the caller consumed the whole stream
+        text = "".join(parts).strip()
+        if text:
+            _cache_put(key, text)
+        logger.info(
+            f"[LLMClient] Stream OK | latency={time.monotonic() - t0:.2f}s | "
+            f"chars={chars} | model={self.model}"
+        )
+
     async def complete(self, prompt: str) -> str:
         """
         Single-string LLM call — convenience alias for generate_response(prompt=...).
@@ -239,6 +451,7 @@ class LLMClient:
         messages:      Optional[List[Dict[str,str]]] = None,
         temperature:   Optional[float]            = None,
         max_tokens:    Optional[int]              = None,
+        stop:          Optional[List[str]]        = None,
     ) -> str:
         """
         Sync LLM call for Planner/AgentController (non-async callers).
@@ -247,14 +460,16 @@ class LLMClient:
         temp    = temperature if temperature is not None else self.temperature
         max_tok = max_tokens  if max_tokens  is not None else self.max_tokens
         msgs    = self._make_messages(prompt, system_prompt, messages)
-        key     = _cache_key(self.model, msgs, temp)
+        msgs_json = _json_dumps(msgs)   # encoded once: cache key + request body
+        key     = _cache_key(self.model, msgs_json, temp, max_tok, stop)
 
         hit = _cache_get(key)
         if hit:
             logger.info("[LLMClient] Cache hit (sync)")
             return hit
 
-        payload    = self._payload(msgs, temp, max_tok)
+        payload    = self._payload(_prencoded(msgs_json, msgs), temp, max_tok, stop)
+        body       = _json_dumps(payload)   # encoded once, reused by every attempt
         last_error = None
 
         for attempt in range(1, self.max_retries + 1):
@@ -264,14 +479,14 @@ class LLMClient:
                     f"[LLMClient] Sync attempt {attempt}/{self.max_retries} "
                     f"-> POST {self._chat_url} (timeout={self.timeout}s)"
                 )
-                with httpx.Client(timeout=self.timeout) as client:
-                    resp = client.post(
-                        self._chat_url,
-                        json=payload,
-                        headers={"Content-Type": "application/json"},
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
+                resp = self._get_http_sync().post(
+                    self._chat_url,
+                    content=body,
+                    headers={"Content-Type": "application/json"},
+                    timeout=self.timeout,
+                )
+                resp.raise_for_status()
+                data = _json_loads(resp.content)
 
                 latency = time.monotonic() - t0
                 text    = self._parse(data)
@@ -304,9 +519,10 @@ class LLMClient:
                 logger.debug(traceback.format_exc())
 
             if attempt < self.max_retries:
-                wait = max(2, 2 ** (attempt - 1))
-                logger.info(f"[LLMClient] Retrying sync in {wait}s...")
-                time.sleep(wait)
+                wait = _retry_delay(attempt, last_error)
+                logger.info(f"[LLMClient] Retrying sync in {wait:.2f}s...")
+                if wait:
+                    time.sleep(wait)
 
         logger.error(f"[LLMClient] All sync attempts failed. Last: {last_error}")
         return f"LLM_ERROR: {type(last_error).__name__}: {last_error}"
@@ -327,12 +543,11 @@ class LLMClient:
             "error":        None,
         }
         try:
-            with httpx.Client(timeout=6) as client:
-                resp = client.get(self._models_url)
-                resp.raise_for_status()
+            resp = self._get_http_sync().get(self._models_url, timeout=6)
+            resp.raise_for_status()
 
             result["available"] = True
-            ids = [m.get("id", "") for m in resp.json().get("data", [])]
+            ids = [m.get("id", "") for m in _json_loads(resp.content).get("data", [])]
             loaded = any(self.model in i or i in self.model for i in ids)
             result["model_loaded"] = loaded
 
@@ -355,9 +570,9 @@ class LLMClient:
         return result
 
 
-# Kept for backward compat with backend/__init__.py
+# Kept for backward compat with backend/__init__.py — defaults come from settings
 def create_llm_client(
-    base_url: str = "http://localhost:1234/v1",
-    model:    str = "phi-3.1-mini-4k-instruct",
+    base_url: Optional[str] = None,
+    model:    Optional[str] = None,
 ) -> LLMClient:
     return LLMClient(base_url=base_url, model=model)
@@ -18,15 +18,30 @@ Version: 1.0.0
 
 import json
 import asyncio
-import re
-from typing import Dict, Any, List, Optional
+import dataclasses
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Any, List, Optional, Sequence, Tuple, ClassVar
 from datetime import datetime
+from urllib.parse import urlsplit
 
 import aiohttp
 
-from .planner import ActionDecision
+from .planner import ActionDecision, BraceScanner, find_json_objects
+from .llm_client import _hash64, _parse_sse_delta
 from .utils.logger import get_logger
 
+# orjson (bytes out, str/bytes in) when installed, stdlib json otherwise.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode()
+    _json_loads = json.loads
+
 
 logger = get_logger(__name__)
 
@@ -43,6 +58,31 @@ DEFAULT_TEMPERATURE = 0.2
 LLM_TIMEOUT = 15.0  # seconds
 LLM_REQUEST_TIMEOUT = 30.0  # seconds with connection time
 
+# Recent steps shown to the LLM in the user prompt
+PROMPT_HISTORY_STEPS = 3
+
+# Keep-alive pool for the shared aiohttp session (see _get_session)
+_CONNECTOR_KWARGS = dict(
+    limit=32,
+    limit_per_host=16,
+    keepalive_timeout=30.0,
+    ttl_dns_cache=300,
+    enable_cleanup_closed=True,
+)
+
+# Decisions remembered per planner, keyed by page + goal (LRU)
+DECISION_CACHE_SIZE = 100
+# Step results (execution status / memory result) that mean the step failed
+_FAILED_RESULTS = frozenset({"fail", "failed", "soft_failure", "error"})
+
+# Default cap on concurrent LLM calls in batch_replan. LM Studio queues
+# requests beyond its parallel-slot setting, so raising this past the
+# server's slots only adds waiting, not throughput.
+BATCH_REPLAN_CONCURRENCY = 8
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
 
 # ============================================================================
 # Prompts
@@ -74,11 +114,44 @@ Example output:
 {"action": "scroll", "selector": null, "text": "down", "explanation": "Scrolling down to find more courses"}
 {"action": "finish", "selector": null, "text": null, "explanation": "Goal achieved - user has access to Python course"}"""
 
+# The system turn never changes, so it is encoded once per process and
+# spliced into every request body (see LLMPlanner._request_body)
+_SYSTEM_MSG_JSON = _json_dumps({"role": "system", "content": SYSTEM_PROMPT})
+
+
+_PROMPT_TEMPLATE = """GOAL: {goal}
+
+CURRENT PAGE:
+URL: {url}
+Title: {title}
+Text Summary: {text_summary}
+
+AVAILABLE ELEMENTS:
+Buttons:
+{buttons}
+
+Links:
+{links}
+
+Inputs:
+{inputs}
+
+RECENT ACTION HISTORY:
+{history}
+
+Your task: Decide the next best action to achieve the goal.
+Return only valid JSON action."""
+
+
+def _fmt_lines(items, limit: int, fmt, empty: str = "  (none)") -> str:
+    """Format at most ``limit`` items one per line, without copying the rest."""
+    return "\n".join(map(fmt, islice(items, limit))) or empty
+
 
 def _build_user_prompt(
     goal: str,
     observation: Dict[str, Any],
-    history: List[Dict[str, Any]]
+    history: Sequence[Dict[str, Any]]
 ) -> str:
     """
     Build user prompt for LLM with goal, observation, history.
@@ -86,64 +159,99 @@ def _build_user_prompt(
     Args:
         goal: User goal
         observation: Current page observation
-        history: Action history
+        history: {step, action, result} dicts, oldest first (list or deque)
         
     Returns:
         User prompt string
     """
-    # Observation summary
-    url = observation.get("url", "unknown")
-    title = observation.get("title", "")
-    text_summary = observation.get("main_text_summary", "")[:300]  # Limit text
-    
-    # Available elements
-    buttons = observation.get("buttons", [])
-    links = observation.get("links", [])
-    inputs = observation.get("inputs", [])
-    
-    buttons_str = "\n".join(
-        [f"  • {b.get('text', '')[:40]} ({b.get('selector', '')})" for b in buttons[:5]]
-    ) or "  (none)"
-    
-    links_str = "\n".join(
-        [f"  • {l.get('text', '')[:40]} ({l.get('selector', '')})" for l in links[:5]]
-    ) or "  (none)"
-    
-    inputs_str = "\n".join(
-        [f"  • {i.get('name', '')[:30]} (type: {i.get('type', 'text')})" for i in inputs[:3]]
-    ) or "  (none)"
+    return _PROMPT_TEMPLATE.format_map({
+        "goal": goal,
+        "url": observation.get("url", "unknown"),
+        "title": observation.get("title", ""),
+        "text_summary": observation.get("main_text_summary", "")[:300],  # Limit text
+        "buttons": _fmt_lines(
+            observation.get("buttons", ()), 5,
+            lambda b: f"  • {b.get('text', '')[:40]} ({b.get('selector', '')})"
+        ),
+        "links": _fmt_lines(
+            observation.get("links", ()), 5,
+            lambda l: f"  • {l.get('text', '')[:40]} ({l.get('selector', '')})"
+        ),
+        "inputs": _fmt_lines(
+            observation.get("inputs", ()), 3,
+            lambda i: f"  • {i.get('name', '')[:30]} (type: {i.get('type', 'text')})"
+        ),
+        # Recent history (last PROMPT_HISTORY_STEPS steps)
+        "history": _fmt_lines(
+            islice(history, max(len(history) - PROMPT_HISTORY_STEPS, 0), None),
+            PROMPT_HISTORY_STEPS,
+            lambda step: f"  Step {step.get('step', '?')}: {step.get('action', '?')} -> {step.get('result', '?')}",
+            empty="  (no history)"
+        ),
+    })
+
+
+def page_fingerprint(goal: str, page_state: Dict[str, Any]) -> int:
+    """
+    64-bit fingerprint of the parts of an observation a decision depends on.
     
-    # Recent history
-    recent_history = history[-3:] if history else []
-    history_str = "\n".join(
-        [f"  Step {step.get('step', '?')}: {step.get('action', '?')} -> {step.get('result', '?')}"
-         for step in recent_history]
-    ) or "  (no history)"
+    Covers the goal, title and top five button selectors (not the page
+    text, so cosmetic text changes still hit the cache). Uses the same
+    xxh3 / blake2b hash as the LLM response cache.
+    """
+    buttons = sorted(b.get("selector", "") for b in page_state.get("buttons", [])[:5])
+    return _hash64(f"{goal}|{page_state.get('title', '')}|{buttons}".encode())
+
+
+def _last_step_failed(
+    history: List[Dict[str, Any]],
+    recent: Optional[Sequence[Dict[str, Any]]]
+) -> bool:
+    """True if the most recent step (from recent, else history) failed."""
+    if recent:
+        result = recent[-1].get("result")
+    elif history:
+        result = history[-1].get("execution", {}).get("status")
+    else:
+        return False
+    return result in _FAILED_RESULTS
+
+
+def _decision_key(goal: str, page_state: Dict[str, Any]) -> Tuple[str, int]:
+    """
+    Cache key for a planning decision: (host + path, page_fingerprint).
     
-    prompt = f"""GOAL: {goal}
+    Query strings and fragments are ignored.
+    """
+    parts = urlsplit(page_state.get("url", ""))
+    return parts.netloc + parts.path, page_fingerprint(goal, page_state)
 
-CURRENT PAGE:
-URL: {url}
-Title: {title}
-Text Summary: {text_summary}
 
-AVAILABLE ELEMENTS:
-Buttons:
-{buttons_str}
+def _new_session() -> aiohttp.ClientSession:
+    """Open a keep-alive planner session on the running loop."""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(**_CONNECTOR_KWARGS),
+        timeout=aiohttp.ClientTimeout(total=LLM_REQUEST_TIMEOUT),
+    )
 
-Links:
-{links_str}
 
-Inputs:
-{inputs_str}
+def _get_session() -> aiohttp.ClientSession:
+    """Return the process-wide planner session, creating it on the running loop."""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = _new_session()
+        _session_loop = loop
+    return _session
 
-RECENT ACTION HISTORY:
-{history_str}
 
-Your task: Decide the next best action to achieve the goal.
-Return only valid JSON action."""
-    
-    return prompt
+async def close_session() -> None:
+    """Close the shared planner session (call once at server shutdown)."""
+    global _session, _session_loop
+    if _session is not None:
+        await _session.close()
+        _session = None
+        _session_loop = None
 
 
 # ============================================================================
@@ -162,14 +270,23 @@ class LLMPlanner:
         api_base: LM Studio API endpoint (default: http://localhost:1234/v1)
         temperature: LLM temperature (default: 0.2 for determinism)
         _logger: Configured logger
-        _session: aiohttp session for API calls
+    
+    Instances share one keep-alive aiohttp session (_get_session), closed
+    by ``await close_session()`` at server shutdown. ``async with
+    LLMPlanner(...) as planner:`` gives that planner its own session for
+    the block instead, closed on exit (or by ``await planner.shutdown()``);
+    the shared session is left alone. Nothing is closed on garbage
+    collection.
     """
     
+    _shared: ClassVar[Dict[Tuple[str, str], "LLMPlanner"]] = {}
+    
     def __init__(
         self,
         model_name: str = DEFAULT_MODEL_NAME,
         api_base: str = LM_STUDIO_DEFAULT_URL,
-        temperature: float = DEFAULT_TEMPERATURE
+        temperature: float = DEFAULT_TEMPERATURE,
+        stream: bool = False
     ):
         """
         Initialize LLM planner.
@@ -178,50 +295,120 @@ class LLMPlanner:
             model_name: Model to use (e.g., "local-model")
             api_base: LM Studio API endpoint URL
             temperature: Temperature for deterministic responses (default 0.2)
+            stream: Stream tokens and stop as soon as the first complete JSON
+                object parses (cuts generation short; only the first object
+                is returned, rather than the last)
         """
         self.model_name = model_name
         self.api_base = api_base
         self.temperature = temperature
+        self.stream = stream
+        # Encoded request body up to the user prompt, rebuilt if settings change
+        self._body_key: Optional[Tuple[str, float, bool]] = None
+        self._body_prefix = b""
         self._logger = get_logger(f"llm_planner.{id(self)}")
+        self._cache: "OrderedDict[Tuple[str, int], ActionDecision]" = OrderedDict()
+        self._cache_max = DECISION_CACHE_SIZE
+        # Last page key seen per goal: the planner is shared, so concurrent
+        # runs must not see each other's "previous page"
+        self._last_key: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        # (page_state, its selectors) for the most recently validated page
+        self._selector_cache: Tuple[Optional[Dict[str, Any]], frozenset] = (None, frozenset())
+        # Session owned by this instance (inside ``async with``), else None
         self._session: Optional[aiohttp.ClientSession] = None
         self._logger.debug(
             f"LLMPlanner initialized: model={model_name}, api={api_base}, temp={temperature}"
         )
     
+    @classmethod
+    def get_shared(
+        cls,
+        model_name: str = DEFAULT_MODEL_NAME,
+        api_base: str = LM_STUDIO_DEFAULT_URL
+    ) -> "LLMPlanner":
+        """
+        Return the process-wide planner for (api_base, model_name).
+        
+        Args:
+            model_name: Model to use
+            api_base: LM Studio API endpoint URL
+            
+        Returns:
+            Shared LLMPlanner instance
+        """
+        key = (api_base, model_name)
+        planner = cls._shared.get(key)
+        if planner is None:
+            planner = cls._shared[key] = cls(model_name=model_name, api_base=api_base)
+        return planner
+    
     async def replan_next_action(
         self,
         goal: str,
         page_state: Dict[str, Any],
         history: List[Dict[str, Any]],
-        failures: List[Dict[str, Any]]
+        failures: List[Dict[str, Any]],
+        recent: Optional[Sequence[Dict[str, Any]]] = None
     ) -> ActionDecision:
         """
         Decide next action using LLM (with fallback to safe action).
         
+        Decisions are cached by page and goal. A cached decision is reused
+        only when the page changed since the previous call for the same
+        goal and the last step did not fail; otherwise the LLM is asked
+        again so it can see the latest history.
+        
         Args:
             goal: User goal
             page_state: Current page observation
             history: Execution history (all actions)
             failures: Failure history (failed actions only)
+            recent: Pre-shaped {step, action, result} history, e.g.
+                MemoryManager.recent_llm_history(); derived from the tail
+                of history when omitted
             
         Returns:
             ActionDecision with next action
         """
         self._logger.info(f"LLM replanning for goal: {goal[:50]}...")
         
+        key = _decision_key(goal, page_state)
+        repeated = self._last_key.get(goal) == key
+        self._last_key[goal] = key
+        self._last_key.move_to_end(goal)
+        if len(self._last_key) > self._cache_max:
+            self._last_key.popitem(last=False)
+        skip_cache = repeated or _last_step_failed(history, recent)
+        cached = None if skip_cache else self._cache.get(key)
+        if (
+            cached is not None
+            and cached.action in ("click", "type")
+            and not self._selector_exists(cached.target_selector or "", page_state)
+        ):
+            # The key only fingerprints the top buttons; the cached target
+            # is gone from this page, so treat the lookup as a miss
+            del self._cache[key]
+            cached = None
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self._logger.info(f"LLM Decision (cached): {cached.action}")
+            return dataclasses.replace(cached, timestamp=None)
+        
         try:
-            # Prepare history for prompt
-            history_dicts = [
-                {
-                    "step": i + 1,
-                    "action": h.get("decision", {}).get("action", "unknown"),
-                    "result": h.get("execution", {}).get("status", "unknown")
-                }
-                for i, h in enumerate(history[-5:])  # Last 5 steps
-            ]
+            if recent is None:
+                # Shape only the steps the prompt will show
+                start = max(len(history) - PROMPT_HISTORY_STEPS, 0)
+                recent = [
+                    {
+                        "step": start + i + 1,
+                        "action": h.get("decision", {}).get("action", "unknown"),
+                        "result": h.get("execution", {}).get("status", "unknown")
+                    }
+                    for i, h in enumerate(islice(history, start, None))
+                ]
             
             # Build prompts
-            user_prompt = _build_user_prompt(goal, page_state, history_dicts)
+            user_prompt = _build_user_prompt(goal, page_state, recent)
             
             self._logger.debug("Calling LM Studio API...")
             
@@ -239,6 +426,11 @@ class LLMPlanner:
             
             # Validate action
             decision = self._validate_and_build_decision(action_dict, page_state)
+            if not decision.thought.startswith("Fallback"):  # never cache fallbacks
+                self._cache[key] = decision
+                self._cache.move_to_end(key)
+                if len(self._cache) > self._cache_max:
+                    self._cache.popitem(last=False)
             
             self._logger.info(f"LLM Decision: {decision.action} (confidence: {decision.confidence:.2f})")
             return decision
@@ -247,6 +439,33 @@ class LLMPlanner:
             self._logger.error(f"Error in LLM planning: {e}")
             return self._safe_fallback_decision(f"LLM error: {str(e)}")
     
+    async def batch_replan(
+        self,
+        tasks: List[Tuple[str, Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]],
+        concurrency: int = BATCH_REPLAN_CONCURRENCY
+    ) -> List[ActionDecision]:
+        """
+        Decide next actions for several independent goals/sessions concurrently.
+        
+        At most ``concurrency`` LLM calls are in flight at once; all share the
+        pooled planner session. Like replan_next_action, each entry falls back
+        to a safe decision instead of raising.
+        
+        Args:
+            tasks: (goal, page_state, history, failures) per decision
+            concurrency: Maximum simultaneous LLM calls
+            
+        Returns:
+            ActionDecisions in the same order as tasks
+        """
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def _one(task) -> ActionDecision:
+            async with sem:
+                return await self.replan_next_action(*task)
+        
+        return await asyncio.gather(*(_one(t) for t in tasks))
+    
     async def _call_llm(self, user_prompt: str) -> str:
         """
         Call LM Studio API with user prompt.
@@ -257,34 +476,25 @@ class LLMPlanner:
         Returns:
             LLM response string
         """
-        # Create session if needed
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-        
         try:
             url = f"{self.api_base}/chat/completions"
             
-            payload = {
-                "model": self.model_name,
-                "temperature": self.temperature,
-                "messages": [
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ]
-            }
-            
             self._logger.debug(f"Calling LLM at {url}")
             
-            async with self._session.post(
+            session = self._session if self._session is not None else _get_session()
+            async with session.post(
                 url,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=LLM_REQUEST_TIMEOUT)
+                data=self._request_body(user_prompt),
+                headers={"Content-Type": "application/json"}
             ) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     raise Exception(f"LLM API error {response.status}: {error_text[:200]}")
                 
-                data = await response.json()
+                if self.stream:
+                    return await self._read_stream(response)
+                
+                data = _json_loads(await response.read())
                 
                 # Extract message from response
                 if "choices" in data and len(data["choices"]) > 0:
@@ -300,6 +510,48 @@ class LLMPlanner:
             self._logger.error(f"LLM API error: {e}")
             raise
     
+    def _request_body(self, user_prompt: str) -> bytes:
+        """Encode the chat request; everything except the user prompt is encoded once."""
+        key = (self.model_name, self.temperature, self.stream)
+        if key != self._body_key:
+            head: Dict[str, Any] = {"model": self.model_name, "temperature": self.temperature}
+            if self.stream:
+                head["stream"] = True
+            # Reopen the object after its closing "}" to add the messages list
+            self._body_prefix = (
+                _json_dumps(head)[:-1] + b',"messages":['
+                + _SYSTEM_MSG_JSON + b',{"role":"user","content":'
+            )
+            self._body_key = key
+        return self._body_prefix + _json_dumps(user_prompt) + b"}]}"
+    
+    async def _read_stream(self, response: aiohttp.ClientResponse) -> str:
+        """
+        Read an SSE token stream, stopping at the first complete JSON object.
+        
+        Returns:
+            That object's text, or the whole streamed text if none parsed
+        """
+        parts: List[str] = []
+        scanner = BraceScanner()
+        
+        async for raw_line in response.content:
+            delta = _parse_sse_delta(raw_line.decode("utf-8", errors="ignore"))
+            if not delta:
+                continue
+            parts.append(delta)
+            for start, end in scanner.feed(delta):
+                candidate = "".join(parts)[start:end]
+                try:
+                    if isinstance(_json_loads(candidate), dict):
+                        # Drop the connection so the server stops generating
+                        response.close()
+                        return candidate
+                except json.JSONDecodeError:
+                    continue
+        
+        return "".join(parts)
+    
     def _parse_llm_response(self, response: str) -> Optional[Dict[str, Any]]:
         """
         Parse JSON from LLM response safely.
@@ -311,24 +563,27 @@ class LLMPlanner:
             Parsed action dict or None
         """
         try:
-            # Try to find JSON in response
-            json_patterns = [
-                r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}",  # JSON object
-            ]
+            # Fast path: the whole response is the JSON object
+            if response.lstrip().startswith("{"):
+                try:
+                    parsed = _json_loads(response)
+                    if isinstance(parsed, dict):
+                        return parsed
+                except json.JSONDecodeError:
+                    pass
             
-            for pattern in json_patterns:
-                matches = re.findall(pattern, response, re.DOTALL)
-                for match in reversed(matches):  # Try from end
-                    try:
-                        parsed = json.loads(match)
-                        if isinstance(parsed, dict):
-                            return parsed
-                    except json.JSONDecodeError:
-                        continue
+            # Otherwise scan for embedded objects, trying from the end
+            for start, end in reversed(find_json_objects(response)):
+                try:
+                    parsed = _json_loads(response[start:end])
+                    if isinstance(parsed, dict):
+                        return parsed
+                except json.JSONDecodeError:
+                    continue
             
             # Try parsing entire response
             try:
-                parsed = json.loads(response)
+                parsed = _json_loads(response)
                 if isinstance(parsed, dict):
                     return parsed
             except json.JSONDecodeError:
@@ -388,6 +643,9 @@ class LLMPlanner:
         """
         Check if selector exists in page_state.
         
+        The page's selectors are collected into a set once per page_state
+        (kept on the planner, so page_state itself stays JSON-serializable).
+        
         Args:
             selector: CSS selector
             page_state: Current page state
@@ -395,22 +653,16 @@ class LLMPlanner:
         Returns:
             True if selector found
         """
-        # Check links
-        for link in page_state.get("links", []):
-            if link.get("selector") == selector:
-                return True
-        
-        # Check buttons
-        for btn in page_state.get("buttons", []):
-            if btn.get("selector") == selector:
-                return True
-        
-        # Check inputs
-        for inp in page_state.get("inputs", []):
-            if inp.get("selector") == selector:
-                return True
-        
-        return False
+        cached_state, selectors = self._selector_cache
+        if cached_state is not page_state:
+            selectors = frozenset(
+                el.get("selector")
+                for bucket in ("links", "buttons", "inputs")
+                for el in page_state.get(bucket, ())
+                if el.get("selector")
+            )
+            self._selector_cache = (page_state, selectors)
+        return selector in selectors
     
     def _safe_fallback_decision(self, reason: str) -> ActionDecision:
         """
@@ -431,17 +683,25 @@ class LLMPlanner:
             explanation=f"Safe fallback: {reason[:50]}"
         )
     
+    async def __aenter__(self) -> "LLMPlanner":
+        # get_shared() planners serve every session, so they keep using
+        # the shared session rather than one this block would close
+        shared = any(p is self for p in self._shared.values())
+        if self._session is None and not shared:
+            self._session = _new_session()
+        return self
+    
+    async def __aexit__(self, *exc) -> None:
+        await self.shutdown()
+    
     async def shutdown(self):
-        """Cleanup aiohttp session."""
-        if self._session:
-            await self._session.close()
-            self._session = None
+        """
+        Close this planner's own session, if it has one.
+        
+        The shared session other planners use is left open; close it with
+        close_session() at server shutdown.
+        """
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
             self._logger.debug("LLMPlanner session closed")
-    
-    def __del__(self):
-        """Ensure session cleanup on deletion."""
-        if self._session and not self._session.closed:
-            try:
-                asyncio.create_task(self.shutdown())
-            except:
-                pass
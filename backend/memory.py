@@ -1,4 +1,4 @@
-"""
+﻿"""
 Memory system for SANDHYA.AI autonomous agent.
 
 Maintains:
@@ -6,29 +6,104 @@ Maintains:
   - long_term_memory:  persisted task history across sessions
 
 Both stores are keyed by session_id.
-Long-term memory is optionally persisted to a JSON file.
+Long-term memory is optionally persisted to an append-only JSON-Lines file.
 """
 
 import json
 import os
 import time
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import asyncio
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 from .utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Long-term memory file codec: orjson when installed, stdlib json otherwise.
+# _json_line takes a TaskRecord as-is: orjson encodes (slotted) dataclasses
+# natively in one pass, without building the intermediate to_dict() tree.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_line(data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+except ImportError:
+    _json_loads = json.loads
+
+    def _record_default(obj: Any) -> Any:
+        if isinstance(obj, (StepRecord, TaskRecord)):
+            return obj.to_dict()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def _json_line(data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, default=_record_default).encode("utf-8") + b"\n"
+
 # Where long-term memory is persisted (relative to cwd when server runs)
 _MEMORY_DIR = os.path.join(os.path.dirname(__file__), "..", "logs", "memory")
 
+# Successful step results shown by ShortTermMemory.get_results_summary
+RESULTS_SUMMARY_SIZE = 10
+LLM_HISTORY_SIZE = 5  # recent steps kept pre-shaped for planner prompts
+
+# Most recent task records kept in long-term memory
+MAX_LONG_TERM_RECORDS = 500
+
+# One O_APPEND descriptor per memory file, shared by every LongTermMemory
+# (one is created per session) and guarded, with all file I/O, by _IO_LOCK
+_APPEND_FDS: Dict[str, int] = {}
+_IO_LOCK = threading.Lock()
+
+
+def _append_fd(path: str) -> int:
+    """
+    Return the shared append descriptor for path, reopening it if the file
+    was replaced (compaction) or removed since it was opened. Call with
+    _IO_LOCK held.
+    """
+    fd = _APPEND_FDS.get(path)
+    if fd is not None:
+        try:
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                return fd
+        except OSError:
+            pass
+        os.close(fd)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd = _APPEND_FDS[path] = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    return fd
+
+
+@lru_cache(maxsize=1)
+def _iso_second(sec: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+
+
+def _utc_iso_now() -> str:
+    """Current UTC time as ISO-8601 with microseconds and a Z suffix."""
+    # Same text the old utcnow().isoformat() + "Z" produced (microseconds
+    # always shown); the date/time part is formatted once per second
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    return f"{_iso_second(sec)}.{ns // 1000:06d}Z"
+
+
+def _trigrams(text: str) -> set:
+    """Lowercased character 3-grams of text (empty if shorter than 3 chars)."""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
 
 # ============================================================================
 # Data Structures
 # ============================================================================
 
-@dataclass
+# Records accumulate per step and per task: slots drop the per-instance __dict__
+@dataclass(slots=True)
 class StepRecord:
     """Record of a single executed step."""
     step_number: int
@@ -37,14 +112,24 @@ class StepRecord:
     result: str
     success: bool
     duration_ms: int
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
+    timestamp: str = field(default_factory=_utc_iso_now)
     error: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Literal dict: asdict() deep-copies recursively and is much slower
+        return {
+            "step_number": self.step_number,
+            "action": self.action,
+            "parameters": self.parameters,
+            "result": self.result,
+            "success": self.success,
+            "duration_ms": self.duration_ms,
+            "timestamp": self.timestamp,
+            "error": self.error,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskRecord:
     """Full record of a task execution attempt."""
     task_id: str
@@ -67,7 +152,7 @@ class TaskRecord:
             "started_at": self.started_at,
             "completed": self.completed,
             "completed_at": self.completed_at,
-            "steps": [s.to_dict() for s in self.steps],
+            "steps": list(map(StepRecord.to_dict, self.steps)),
             "final_result": self.final_result,
             "iterations": self.iterations,
         }
@@ -93,6 +178,39 @@ class ShortTermMemory:
         self.errors: List[str] = []
         self.variables: Dict[str, Any] = {}   # arbitrary key-value context
         self.started_at: Optional[str] = None
+        self._reset_summaries()
+
+    def _reset_summaries(self) -> None:
+        # Summary lines are formatted once per step as steps are recorded;
+        # the joined strings are memoized until the next step arrives
+        self._summary_lines: List[str] = []
+        self._recent_results: deque = deque(maxlen=RESULTS_SUMMARY_SIZE)
+        self._recent_for_llm: deque = deque(maxlen=LLM_HISTORY_SIZE)
+        self._steps_summary: Optional[str] = None
+        self._results_summary: Optional[str] = None
+
+    def _record(self, record: StepRecord) -> None:
+        """Append a step and update the error list and summaries."""
+        self.steps.append(record)
+        status = "✓" if record.success else "✗"
+        self._summary_lines.append(
+            f"  {status} Step {record.step_number}: {record.action}"
+            f"({json.dumps(record.parameters)[:80]}) → {record.result[:100]}"
+        )
+        self._steps_summary = None
+        self._recent_for_llm.append({
+            "step": record.step_number,
+            "action": record.action,
+            "result": "ok" if record.success else "fail",
+        })
+        if record.success:
+            if record.result:
+                self._recent_results.append(f"  - {record.result[:200]}")
+                self._results_summary = None
+        else:
+            self.errors.append(
+                f"Step {record.step_number} ({record.action}): {record.error or record.result}"
+            )
 
     def start_task(self, task_id: str, goal: str, mode: str) -> None:
         """Reset and start tracking a new task."""
@@ -102,7 +220,8 @@ class ShortTermMemory:
         self.steps = []
         self.errors = []
         self.variables = {}
-        self.started_at = datetime.utcnow().isoformat() + "Z"
+        self.started_at = _utc_iso_now()
+        self._reset_summaries()
         logger.debug(f"[Memory] New task started | id={task_id} | goal={goal[:60]!r}")
 
     def add_step(
@@ -116,7 +235,7 @@ class ShortTermMemory:
         error: Optional[str] = None,
     ) -> None:
         """Record a completed step."""
-        record = StepRecord(
+        self._record(StepRecord(
             step_number=step_number,
             action=action,
             parameters=parameters,
@@ -124,10 +243,12 @@ class ShortTermMemory:
             success=success,
             duration_ms=duration_ms,
             error=error,
-        )
-        self.steps.append(record)
-        if not success:
-            self.errors.append(f"Step {step_number} ({action}): {error or result}")
+        ))
+
+    def add_steps(self, steps: List[Dict[str, Any]]) -> None:
+        """Record several completed steps at once (each dict holds add_step kwargs)."""
+        for kw in steps:
+            self._record(StepRecord(**kw))
 
     def set(self, key: str, value: Any) -> None:
         """Store an arbitrary value in context."""
@@ -139,20 +260,23 @@ class ShortTermMemory:
 
     def get_steps_summary(self) -> str:
         """Human-readable summary of all steps."""
-        if not self.steps:
+        if not self._summary_lines:
             return "No steps executed yet."
-        lines = []
-        for s in self.steps:
-            status = "✓" if s.success else "✗"
-            lines.append(f"  {status} Step {s.step_number}: {s.action}({json.dumps(s.parameters)[:80]}) → {s.result[:100]}")
-        return "\n".join(lines)
+        if self._steps_summary is None:
+            self._steps_summary = "\n".join(self._summary_lines)
+        return self._steps_summary
 
     def get_results_summary(self) -> str:
-        """Summary of results collected so far."""
-        results = [s.result for s in self.steps if s.success and s.result]
-        if not results:
+        """Summary of results collected so far (last RESULTS_SUMMARY_SIZE)."""
+        if not self._recent_results:
             return "No results collected."
-        return "\n".join(f"  - {r[:200]}" for r in results[-10:])  # last 10
+        if self._results_summary is None:
+            self._results_summary = "\n".join(self._recent_results)
+        return self._results_summary
+
+    def recent_llm_history(self) -> deque:
+        """Last LLM_HISTORY_SIZE steps as {step, action, result} dicts (live view)."""
+        return self._recent_for_llm
 
     def has_errors(self) -> bool:
         return bool(self.errors)
@@ -164,7 +288,7 @@ class ShortTermMemory:
             session_id=session_id,
             goal=self.goal,
             mode=self.mode,
-            started_at=self.started_at or datetime.utcnow().isoformat() + "Z",
+            started_at=self.started_at or _utc_iso_now(),
             steps=list(self.steps),
         )
 
@@ -178,50 +302,152 @@ class LongTermMemory:
     Persisted task history.
 
     On startup, loads existing records from disk.
-    After each task, appends the completed record.
+    After each task, appends the completed record as one JSON line; a
+    later line for the same task_id supersedes earlier ones. The file is
+    compacted once it holds more than twice as many lines as live records.
+    File I/O is serialized by a module-wide lock so store_task_async can
+    run it in a worker thread, and appends reuse one shared descriptor.
     """
 
     def __init__(self, persist_path: Optional[str] = None):
-        self.persist_path = persist_path or os.path.join(_MEMORY_DIR, "long_term.json")
-        self.records: List[TaskRecord] = []
+        self.persist_path = persist_path or os.path.join(_MEMORY_DIR, "long_term.jsonl")
+        self._records: Dict[str, TaskRecord] = {}   # task_id -> record, oldest first
+        self._lines = 0                              # lines currently in the file
+        # Goal trigram -> task_ids, for search_by_goal; built on first search
+        # and kept current from then on
+        self._trigram_idx: Optional[Dict[str, set]] = None
         self._load()
 
+    @property
+    def records(self) -> List[TaskRecord]:
+        """Live records, oldest first."""
+        return list(self._records.values())
+
+    @staticmethod
+    def _insert(records: Dict[str, TaskRecord], record: TaskRecord) -> List[TaskRecord]:
+        """
+        Insert or replace a record as the newest, evicting the oldest past the cap.
+
+        Returns:
+            Records dropped from ``records`` (a replaced and/or evicted one)
+        """
+        dropped = []
+        old = records.pop(record.task_id, None)
+        if old is not None:
+            dropped.append(old)
+        records[record.task_id] = record
+        if len(records) > MAX_LONG_TERM_RECORDS:
+            dropped.append(records.pop(next(iter(records))))
+        return dropped
+
+    def _goal_index(self) -> Dict[str, set]:
+        """The trigram index, built from the live records on first use."""
+        if self._trigram_idx is None:
+            self._trigram_idx = defaultdict(set)
+            for record in self._records.values():
+                self._index(self._trigram_idx, record)
+        return self._trigram_idx
+
+    @staticmethod
+    def _index(idx: Dict[str, set], record: TaskRecord) -> None:
+        for gram in _trigrams(record.goal):
+            idx[gram].add(record.task_id)
+
+    @staticmethod
+    def _unindex(idx: Dict[str, set], record: TaskRecord) -> None:
+        for gram in _trigrams(record.goal):
+            ids = idx.get(gram)
+            if ids is not None:
+                ids.discard(record.task_id)
+                if not ids:
+                    del idx[gram]
+
+    @staticmethod
+    def _from_dict(item: Dict[str, Any]) -> TaskRecord:
+        item["steps"] = [StepRecord(**s) for s in item.get("steps", [])]
+        return TaskRecord(**item)
+
+    def _read(self) -> Tuple[Dict[str, TaskRecord], int]:
+        """Read the JSONL file into (records, line count); raises on I/O or parse errors."""
+        records: Dict[str, TaskRecord] = {}
+        lines = 0
+        if os.path.exists(self.persist_path):
+            with open(self.persist_path, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        lines += 1
+                        self._insert(records, self._from_dict(_json_loads(line)))
+        return records, lines
+
     def _load(self) -> None:
-        """Load persisted records from disk."""
+        """Load persisted records from disk (migrating a legacy JSON file once)."""
         try:
-            if os.path.exists(self.persist_path):
-                with open(self.persist_path, "r", encoding="utf-8") as f:
-                    raw = json.load(f)
-                    for item in raw:
-                        steps = [StepRecord(**s) for s in item.get("steps", [])]
-                        item["steps"] = steps
-                        self.records.append(TaskRecord(**item))
-                logger.info(f"[Memory] Loaded {len(self.records)} long-term records")
+            legacy = os.path.splitext(self.persist_path)[0] + ".json"
+            if not os.path.exists(self.persist_path) and os.path.exists(legacy):
+                with open(legacy, "rb") as f:
+                    for item in _json_loads(f.read()):
+                        self._insert(self._records, self._from_dict(item))
+                with _IO_LOCK:
+                    self._write_all(self._records)
+            else:
+                self._records, self._lines = self._read()
+            self._trigram_idx = None
+            logger.info(f"[Memory] Loaded {len(self._records)} long-term records")
         except Exception as e:
             logger.warning(f"[Memory] Could not load long-term memory: {e}")
-            self.records = []
 
-    def _save(self) -> None:
-        """Persist all records to disk."""
-        try:
-            os.makedirs(os.path.dirname(self.persist_path), exist_ok=True)
-            data = [r.to_dict() for r in self.records]
-            with open(self.persist_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            logger.warning(f"[Memory] Could not save long-term memory: {e}")
+    def _write_all(self, records: Dict[str, TaskRecord]) -> None:
+        """Atomically rewrite the file with one line per record. Call with _IO_LOCK held."""
+        os.makedirs(os.path.dirname(self.persist_path), exist_ok=True)
+        tmp = self.persist_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.writelines(_json_line(r) for r in records.values())
+        # Windows won't replace a file that is still open; the next append
+        # reopens the descriptor
+        fd = _APPEND_FDS.pop(self.persist_path, None)
+        if fd is not None:
+            os.close(fd)
+        os.replace(tmp, self.persist_path)
+        self._lines = len(records)
+
+    def _persist(self, record: TaskRecord) -> None:
+        """Append one record to the file, compacting it when it has grown too long."""
+        with _IO_LOCK:
+            try:
+                os.write(_append_fd(self.persist_path), _json_line(record))
+                self._lines += 1
+            except Exception as e:
+                logger.warning(f"[Memory] Could not save long-term memory: {e}")
+                return
+
+            if self._lines > 2 * len(self._records):
+                # Compact from the file, not self._records, so lines appended
+                # by other instances are kept
+                try:
+                    self._write_all(self._read()[0])
+                except Exception as e:
+                    logger.warning(f"[Memory] Could not compact long-term memory: {e}")
+
+    def _accept(self, record: TaskRecord) -> None:
+        record.completed_at = _utc_iso_now()
+        record.completed = True
+        dropped = self._insert(self._records, record)
+        idx = self._trigram_idx
+        if idx is not None:
+            for old in dropped:
+                self._unindex(idx, old)
+            self._index(idx, record)
 
     def store_task(self, record: TaskRecord) -> None:
         """Append a completed task record and persist."""
-        record.completed_at = datetime.utcnow().isoformat() + "Z"
-        record.completed = True
-        # Avoid duplicates
-        self.records = [r for r in self.records if r.task_id != record.task_id]
-        self.records.append(record)
-        # Keep last 500 records
-        if len(self.records) > 500:
-            self.records = self.records[-500:]
-        self._save()
+        self._accept(record)
+        self._persist(record)
+        logger.debug(f"[Memory] Stored task {record.task_id!r} to long-term memory")
+
+    async def store_task_async(self, record: TaskRecord) -> None:
+        """Like store_task, with the file write run in a worker thread."""
+        self._accept(record)
+        await asyncio.to_thread(self._persist, record)
         logger.debug(f"[Memory] Stored task {record.task_id!r} to long-term memory")
 
     def get_recent(self, n: int = 5) -> List[TaskRecord]:
@@ -231,7 +457,19 @@ class LongTermMemory:
     def search_by_goal(self, keyword: str) -> List[TaskRecord]:
         """Find tasks whose goal contains the keyword (case-insensitive)."""
         kw = keyword.lower()
-        return [r for r in self.records if kw in r.goal.lower()]
+        grams = _trigrams(kw)
+        if not grams:
+            # Under 3 chars: nothing to look up, scan every goal
+            return [r for r in self.records if kw in r.goal.lower()]
+        # Candidates hold every trigram of the keyword (smallest posting
+        # list first); confirm the substring on those only
+        idx = self._goal_index()
+        postings = sorted((idx.get(g, ()) for g in grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return [
+            r for r in self._records.values()
+            if r.task_id in candidates and kw in r.goal.lower()
+        ]
 
     def summary(self) -> str:
         """Human-readable summary of task history."""
@@ -273,6 +511,9 @@ class MemoryManager:
     def add_step(self, **kwargs) -> None:
         self.short_term.add_step(**kwargs)
 
+    def add_steps(self, steps: List[Dict[str, Any]]) -> None:
+        self.short_term.add_steps(steps)
+
     def set(self, key: str, value: Any) -> None:
         self.short_term.set(key, value)
 
@@ -285,14 +526,17 @@ class MemoryManager:
     def results_summary(self) -> str:
         return self.short_term.get_results_summary()
 
+    def recent_llm_history(self) -> deque:
+        return self.short_term.recent_llm_history()
+
     # ---- Complete and archive current task ----
 
-    def complete_task(self, final_result: str, iterations: int = 1) -> None:
-        """Mark current task as done, move to long-term memory."""
+    async def complete_task(self, final_result: str, iterations: int = 1) -> None:
+        """Mark current task as done, move to long-term memory (written off-loop)."""
         record = self.short_term.to_task_record(self.session_id)
         record.final_result = final_result
         record.iterations = iterations
-        self.long_term.store_task(record)
+        await self.long_term.store_task_async(record)
         logger.info(
             f"[Memory] Task complete | id={record.task_id} | "
             f"steps={len(record.steps)} | iterations={iterations}"
@@ -4,7 +4,7 @@ Data models and schemas for the Agent API.
 
 from enum import Enum
 from typing import List, Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class IntentType(str, Enum):
@@ -45,9 +45,13 @@ class ActionType(str, Enum):
     SEARCH_WEB = "search_web"
 
 
+_ACTION_NAMES = frozenset(a.value for a in ActionType)
+
+
 class ActionStep(BaseModel):
     """Single step in an automation plan."""
-    action: ActionType
+    # Stored as the plain ActionType value; checked against _ACTION_NAMES
+    action: str
     value: Optional[str] = None
     selector: Optional[str] = None
     duration_ms: Optional[int] = None
@@ -55,9 +59,19 @@ class ActionStep(BaseModel):
         None, 
         description="Human-readable description of the action"
     )
+    group: Optional[int] = Field(
+        None,
+        description="Adjacent steps sharing a group are independent and may run concurrently"
+    )
 
-    class Config:
-        use_enum_values = True
+    @field_validator("action", mode="before")
+    @classmethod
+    def _known_action(cls, v: Any) -> Any:
+        if isinstance(v, ActionType):
+            return v.value
+        if isinstance(v, str) and v not in _ACTION_NAMES:
+            raise ValueError(f"Unknown action: {v!r}")
+        return v
 
 
 class ActionPlan(BaseModel):
@@ -68,9 +82,6 @@ class ActionPlan(BaseModel):
         description="Why these steps were chosen"
     )
 
-    class Config:
-        use_enum_values = True
-
 
 class MessageRequest(BaseModel):
     """User message to the agent."""
@@ -85,8 +96,7 @@ class MessageResponse(BaseModel):
     plan: Optional[ActionPlan] = None
     session_id: Optional[str] = None
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class StreamingMessage(BaseModel):
@@ -95,9 +105,6 @@ class StreamingMessage(BaseModel):
     content: str
     is_final: bool = False
 
-    class Config:
-        use_enum_values = True
-
 
 class AgentConfig(BaseModel):
     """Configuration for the agent."""
@@ -148,9 +155,12 @@ class GoalStep(BaseModel):
     action: str = Field(..., description="Tool name to execute")
     parameters: dict = Field(default_factory=dict, description="Tool parameters")
     description: Optional[str] = Field(None, description="Human-readable step description")
+    group: Optional[int] = Field(
+        None,
+        description="Adjacent steps sharing a group are independent and may run concurrently"
+    )
 
-    class Config:
-        extra = "allow"
+    model_config = ConfigDict(extra="allow")
 
 
 class GoalPlan(BaseModel):
@@ -170,8 +180,7 @@ class GoalPlan(BaseModel):
         description="Multi-agent deliberation payload: planner_plan, critic_feedback, refined_plan"
     )
 
-    class Config:
-        extra = "allow"
+    model_config = ConfigDict(extra="allow")
 
 
 class AutonomousRunReport(BaseModel):
@@ -184,6 +193,3 @@ class AutonomousRunReport(BaseModel):
     final_message: str
     validation_reason: str = ""
     task_id: str = ""
-
-    class Config:
-        use_enum_values = True
@@ -22,11 +22,14 @@ Version: 1.0.0
 
 import json
 import logging
+import re
 import traceback
 import uuid
-from typing import List, Optional, Dict, Any
+from collections import Counter, deque
+from typing import Deque, List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 
 from .models.schemas import ActionPlan, ExecutionReport, StreamingMessage
 from .llm_client import LLMClient
@@ -47,21 +50,35 @@ MAX_ITERATIONS = 10
 MAX_DUPLICATE_ACTIONS = 2
 NAVIGATION_DRIFT_THRESHOLD = 3  # Number of navigation attempts before abort
 MEMORY_WINDOW_SIZE = 20  # Number of recent steps to track for loop detection
+INTENT_CACHE_SIZE = 256  # Normalized messages whose intent is remembered
 
 # Intent keywords
-AUTOMATION_KEYWORDS = {
+AUTOMATION_KEYWORDS = frozenset({
     "open", "search", "click", "navigate", "read", "extract",
     "find", "list", "download", "upload", "fill", "select",
     "scroll", "wait", "submit", "enter", "go to", "visit",
     "browse", "access", "type", "press", "check", "uncheck",
     "verify", "screenshot", "refresh"
-}
+})
 
-AUTONOMOUS_KEYWORDS = {
+AUTONOMOUS_KEYWORDS = frozenset({
     "find best", "research", "explore", "compare", "analyze",
     "keep trying", "investigate", "discover", "summarize",
     "evaluate", "rank", "recommend", "find all", "collect"
-}
+})
+
+
+def _keyword_matcher(keywords) -> "re.Pattern[str]":
+    """
+    Compile a keyword set into one alternation, so a message is scanned
+    once per set instead of once per keyword. Matches are plain substrings,
+    like the ``keyword in message`` checks this replaces.
+    """
+    return re.compile("|".join(map(re.escape, sorted(keywords, key=len, reverse=True))))
+
+
+_AUTONOMOUS_MATCHER = _keyword_matcher(AUTONOMOUS_KEYWORDS)
+_AUTOMATION_MATCHER = _keyword_matcher(AUTOMATION_KEYWORDS)
 
 # Conversational status messages
 STATUS_MESSAGES = {
@@ -91,6 +108,25 @@ class IntentMode(Enum):
     AUTONOMOUS_GOAL = "autonomous_goal"
 
 
+@lru_cache(maxsize=INTENT_CACHE_SIZE)
+def _classify_cached(norm_msg: str) -> IntentMode:
+    """Keyword intent of a lowercased, whitespace-normalized message (chat included)."""
+    # Autonomous goal patterns first (highest specificity)
+    if _AUTONOMOUS_MATCHER.search(norm_msg):
+        return IntentMode.AUTONOMOUS_GOAL
+    if _AUTOMATION_MATCHER.search(norm_msg):
+        return IntentMode.CONTROLLED_AUTOMATION
+    return IntentMode.CHAT
+
+
+def reload_intents() -> None:
+    """Recompile the keyword matchers after AUTOMATION_KEYWORDS / AUTONOMOUS_KEYWORDS are reassigned."""
+    global _AUTONOMOUS_MATCHER, _AUTOMATION_MATCHER
+    _AUTONOMOUS_MATCHER = _keyword_matcher(AUTONOMOUS_KEYWORDS)
+    _AUTOMATION_MATCHER = _keyword_matcher(AUTOMATION_KEYWORDS)
+    _classify_cached.cache_clear()
+
+
 # ============================================================================
 # AgentOrchestrator Class
 # ============================================================================
@@ -125,6 +161,7 @@ class AgentOrchestrator:
         autonomous_controller: AutonomousAgentController,
         session_id: str = None,
         goal_planner: Optional[GoalPlanner] = None,
+        validation_agent: Optional[ValidationAgent] = None,
     ):
         """
         Initialize the orchestrator with required components.
@@ -136,6 +173,7 @@ class AgentOrchestrator:
             autonomous_controller: AutonomousAgentController for autonomous mode
             session_id: Optional session identifier for logging/tracking
             goal_planner: GoalPlanner for SANDHYA.AI full-tool autonomous mode
+            validation_agent: ValidationAgent for goal completion checks
         """
         self.planner = planner
         self.executor = executor
@@ -144,14 +182,16 @@ class AgentOrchestrator:
 
         # SANDHYA.AI full-tool autonomous components
         self.goal_planner: GoalPlanner = goal_planner or GoalPlanner(llm_client)
-        self.validation_agent: ValidationAgent = ValidationAgent(llm_client)
+        self.validation_agent: ValidationAgent = validation_agent or ValidationAgent(llm_client)
 
         # Conversation state
         self.conversation_history: List[Dict[str, Any]] = []
         self.pending_plan: Optional[ActionPlan] = None
         self.pending_goal_plan = None          # GoalPlan for new ToolRegistry path
         self.last_observation: Optional[Dict[str, Any]] = None
-        self.executed_steps_memory: List[str] = []
+        # Last MEMORY_WINDOW_SIZE action ids, with per-id counts kept in step
+        self.executed_steps_memory: Deque[str] = deque(maxlen=MEMORY_WINDOW_SIZE)
+        self._step_counts: Counter = Counter()
 
         # Mode tracking
         self.current_mode: IntentMode = IntentMode.CHAT
@@ -194,6 +234,7 @@ class AgentOrchestrator:
         
         This is a fast, deterministic classification that avoids LLM calls
         for performance. It checks for keyword presence and patterns.
+        Results are cached per lowercased, whitespace-normalized message.
         
         Routing rules:
           1. If message contains autonomous keywords → autonomous_goal
@@ -206,21 +247,9 @@ class AgentOrchestrator:
         Returns:
             IntentMode enum indicating routing destination
         """
-        message_lower = message.lower()
-
-        # Check for autonomous goal patterns (highest specificity)
-        if any(keyword in message_lower for keyword in AUTONOMOUS_KEYWORDS):
-            self._log("debug", f"Intent detected: AUTONOMOUS_GOAL")
-            return IntentMode.AUTONOMOUS_GOAL
-
-        # Check for automation keywords
-        if any(keyword in message_lower for keyword in AUTOMATION_KEYWORDS):
-            self._log("debug", f"Intent detected: CONTROLLED_AUTOMATION")
-            return IntentMode.CONTROLLED_AUTOMATION
-
-        # Default to chat
-        self._log("debug", f"Intent detected: CHAT")
-        return IntentMode.CHAT
+        intent = _classify_cached(" ".join(message.lower().split()))
+        self._log("debug", f"Intent detected: {intent.name}")
+        return intent
 
     # ========================================================================
     # Main Entry Point
@@ -542,7 +571,7 @@ class AgentOrchestrator:
         self._log("info", "Executing approved plan")
 
         try:
-            self.executed_steps_memory = []
+            self._reset_step_memory()
 
             # ── New GoalPlan path (ToolRegistry + BrowserSingleton) ──────────
             if self.pending_goal_plan is not None:
@@ -562,7 +591,7 @@ class AgentOrchestrator:
                 exec_.set_status_callback(lambda m: self._log("info", f"[Exec] {m}"))
 
                 step_results = await exec_.execute_plan(goal_plan)
-                memory.complete_task("controlled execution complete", iterations=1)
+                await memory.complete_task("controlled execution complete", iterations=1)
 
                 successes = sum(1 for r in step_results if r["success"])
                 failures  = len(step_results) - successes
@@ -659,7 +688,7 @@ class AgentOrchestrator:
 
         try:
             # Reset memory for this autonomous execution
-            self.executed_steps_memory = []
+            self._reset_step_memory()
 
             # Inform user
             opening_message = (
@@ -806,7 +835,7 @@ class AgentOrchestrator:
             final_reply = f"LLM_ERROR: {type(e).__name__}: {e}"
 
         finally:
-            memory.complete_task(final_reply, iterations=iteration)
+            await memory.complete_task(final_reply, iterations=iteration)
 
         return final_reply
 
@@ -827,16 +856,29 @@ class AgentOrchestrator:
         """
         action_id = f"{action_type}:{target}" if target else action_type
 
-        # Count occurrences in recent memory
-        recent_count = self.executed_steps_memory[-MEMORY_WINDOW_SIZE:].count(action_id)
+        # Occurrences within the recent window
+        recent_count = self._step_counts[action_id]
 
         if recent_count >= MAX_DUPLICATE_ACTIONS:
             self._log("warning", f"Step duplication detected: {action_id} (x{recent_count})")
             return True
 
-        self.executed_steps_memory.append(action_id)
+        memory = self.executed_steps_memory
+        if len(memory) == MEMORY_WINDOW_SIZE:
+            # The append below evicts the oldest id from the window
+            evicted = memory[0]
+            self._step_counts[evicted] -= 1
+            if not self._step_counts[evicted]:
+                del self._step_counts[evicted]
+        memory.append(action_id)
+        self._step_counts[action_id] += 1
         return False
 
+    def _reset_step_memory(self) -> None:
+        """Forget recently executed steps (start of a new plan or session)."""
+        self.executed_steps_memory.clear()
+        self._step_counts.clear()
+
     def _detect_navigation_drift(self, current_url: str) -> bool:
         """
         Detect if navigation actions are not changing the URL.
@@ -883,7 +925,7 @@ class AgentOrchestrator:
         self.conversation_history = []
         self.pending_plan = None
         self.last_observation = None
-        self.executed_steps_memory = []
+        self._reset_step_memory()
         self.current_mode = IntentMode.CHAT
         self._approval_pending = False
 
@@ -27,6 +27,28 @@ from .utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def index_elements_by_selector(page_state: Dict[str, Any]) -> Dict[str, tuple]:
+    """
+    Build a selector → (kind, element) lookup for a page state.
+    
+    Kinds are "button", "link" and "input". When a selector appears in
+    more than one list, the first kind in that order wins.
+    
+    Args:
+        page_state: Page state dict with buttons/links/inputs lists
+        
+    Returns:
+        Dict mapping selector string to (kind, element dict)
+    """
+    index: Dict[str, tuple] = {}
+    for kind, key in (("button", "buttons"), ("link", "links"), ("input", "inputs")):
+        for element in page_state.get(key, []):
+            selector = element.get("selector")
+            if selector and selector not in index:
+                index[selector] = (kind, element)
+    return index
+
+
 class PageAnalyzer:
     """
     Analyzes the current Playwright page and extracts structured information.
@@ -88,6 +110,7 @@ class PageAnalyzer:
         - buttons: List of button dicts with text and selector
         - inputs: List of input dicts with properties and selector
         - analysis_timestamp: ISO timestamp of analysis
+        - _by_selector: selector → (kind, element) index of the above
         
         Returns:
             Structured page analysis dictionary
@@ -131,6 +154,7 @@ class PageAnalyzer:
                 "inputs": inputs,
                 "analysis_timestamp": self._get_timestamp(),
             }
+            result["_by_selector"] = index_elements_by_selector(result)
             
             self._logger.debug(
                 f"Page analysis complete: {len(links)} links, "
@@ -557,6 +581,7 @@ class PageAnalyzer:
             "buttons": [],
             "inputs": [],
             "analysis_timestamp": self._get_timestamp(),
+            "_by_selector": {},
         }
     
     @staticmethod
@@ -10,7 +10,7 @@ This module includes:
 import json
 import re
 import asyncio
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
@@ -23,6 +23,94 @@ from .utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# JSON extraction patterns, compiled once at import
+_CODE_FENCE_RE = re.compile(r"```(?:json)?")
+# Widest {...} span (first "{" to last "}")
+_JSON_SPAN_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Words ignored when matching goal keywords against element text
+_STOPWORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "is", "are", "was", "were",
+    "i", "you", "he", "she", "it", "we", "they", "that", "this",
+    "to", "for", "in", "on", "at", "by", "from", "with", "as"
+})
+# Score multiplier per element kind in _find_best_matching_link
+_MATCH_WEIGHTS = (("links", 1.0), ("buttons", 1.1))
+
+
+class BraceScanner:
+    """
+    Incremental top-level ``{...}`` locator.
+    
+    Tracks brace depth, skipping braces inside JSON string literals
+    (including escaped quotes), in one linear pass with no regex
+    backtracking. Text can be fed in chunks (e.g. streamed tokens);
+    offsets are relative to everything fed so far.
+    """
+    
+    def __init__(self):
+        self._pos = 0
+        self._depth = 0
+        self._start = 0
+        self._in_string = False
+        self._escape = False
+    
+    def feed(self, chunk: str) -> List[Tuple[int, int]]:
+        """
+        Scan the next chunk of text.
+        
+        Returns:
+            (start, end) slice bounds of objects completed within this chunk
+        """
+        spans: List[Tuple[int, int]] = []
+        depth = self._depth
+        start = self._start
+        in_string = self._in_string
+        escape = self._escape
+        
+        for i, ch in enumerate(chunk, self._pos):
+            if in_string:
+                if escape:
+                    escape = False
+                elif ch == "\\":
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == "{":
+                if depth == 0:
+                    start = i
+                depth += 1
+            elif depth:
+                if ch == '"':
+                    in_string = True
+                elif ch == "}":
+                    depth -= 1
+                    if depth == 0:
+                        spans.append((start, i + 1))
+        
+        self._pos += len(chunk)
+        self._depth, self._start = depth, start
+        self._in_string, self._escape = in_string, escape
+        return spans
+
+
+def find_json_objects(text: str) -> List[Tuple[int, int]]:
+    """
+    Locate top-level ``{...}`` spans in text with one linear scan.
+    
+    Args:
+        text: Raw LLM response
+        
+    Returns:
+        (start, end) slice bounds of each balanced object, in order
+    """
+    return BraceScanner().feed(text)
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove markdown code fences (```json / ```) and surrounding whitespace."""
+    return _CODE_FENCE_RE.sub("", text).strip()
+
 
 # ============================================================================
 # Enums & Data Classes
@@ -159,6 +247,7 @@ Return valid JSON with 'steps' array and 'reasoning' string."""
                         selector=step_data.get("selector"),
                         duration_ms=step_data.get("duration_ms"),
                         description=step_data.get("description"),
+                        group=step_data.get("group") if isinstance(step_data.get("group"), int) else None,
                     )
                     steps.append(step)
                 except (ValueError, KeyError) as e:
@@ -193,12 +282,9 @@ Return valid JSON with 'steps' array and 'reasoning' string."""
             Parsed JSON dict or None
         """
         # Try to find JSON object in the text
-        json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-        matches = re.findall(json_pattern, text, re.DOTALL)
-        
-        for match in reversed(matches):  # Try from end (more likely to be valid)
+        for start, end in reversed(find_json_objects(text)):  # Try from end (more likely to be valid)
             try:
-                return json.loads(match)
+                return json.loads(text[start:end])
             except json.JSONDecodeError:
                 continue
         
@@ -707,12 +793,9 @@ Return STRICT JSON (no other text):
             Parsed dict or None
         """
         # Try to find JSON object
-        json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-        matches = re.findall(json_pattern, response, re.DOTALL)
-        
-        for match in reversed(matches):  # Try from end
+        for start, end in reversed(find_json_objects(response)):  # Try from end
             try:
-                return json.loads(match)
+                return json.loads(response[start:end])
             except json.JSONDecodeError:
                 continue
         
@@ -1214,29 +1297,22 @@ class HybridPlanner:
             Best matching link/button dict or None
         """
         goal_keywords = self._extract_keywords(goal)
+        if not goal_keywords:
+            return None
         best_match = None
         best_score = 0
         
-        # Check links
-        for link in page_state.get("links", []):
-            text = link.get("text", "").lower()
-            score = self._calculate_match_score(text, goal_keywords)
-            
-            if score > best_score:
-                best_score = score
-                best_match = link
-        
-        # Check buttons (may have higher priority)
-        for button in page_state.get("buttons", []):
-            text = button.get("text", "").lower()
-            score = self._calculate_match_score(text, goal_keywords)
-            
-            # Buttons get slight boost
-            score *= 1.1
-            
-            if score > best_score:
-                best_score = score
-                best_match = button
+        # Links, then buttons (buttons get a slight boost); the score is
+        # inlined: keyword hits / keyword count
+        n_keywords = len(goal_keywords)
+        for kind, weight in _MATCH_WEIGHTS:
+            for element in page_state.get(kind, ()):
+                text = element.get("text", "").lower()
+                score = weight * sum(kw in text for kw in goal_keywords) / n_keywords
+                
+                if score > best_score:
+                    best_score = score
+                    best_match = element
         
         # Only return if score is significant (>0.5)
         if best_score > 0.5:
@@ -1361,16 +1437,10 @@ class HybridPlanner:
         Returns:
             List of keywords
         """
-        stopwords = {
-            "the", "a", "an", "and", "or", "but", "is", "are", "was", "were",
-            "i", "you", "he", "she", "it", "we", "they", "that", "this",
-            "to", "for", "in", "on", "at", "by", "from", "with", "as"
-        }
-        
         words = text.lower().split()
         keywords = [
             w.strip('.,!?;:') for w in words
-            if len(w) > 2 and w.lower() not in stopwords
+            if len(w) > 2 and w not in _STOPWORDS
         ]
         
         return keywords[:5]  # Limit to first 5 keywords
@@ -1624,12 +1694,9 @@ Remember:
         """
         try:
             # Try to find JSON object in text
-            json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-            matches = re.findall(json_pattern, response, re.DOTALL)
-            
-            for match in reversed(matches):  # Try from end
+            for start, end in reversed(find_json_objects(response)):  # Try from end
                 try:
-                    return json.loads(match)
+                    return json.loads(response[start:end])
                 except json.JSONDecodeError:
                     continue
             
@@ -1877,6 +1944,7 @@ class GoalPlanner:
                 action=action,
                 parameters=params,
                 description=item.get("description"),
+                group=item.get("group") if isinstance(item.get("group"), int) else None,
             ))
 
         return GoalPlan(
@@ -1890,13 +1958,13 @@ class GoalPlanner:
     def _extract_json(self, text: str) -> Optional[dict]:
         """Extract first valid JSON object from text."""
         # Strip markdown fences
-        text = re.sub(r"```(?:json)?", "", text).strip()
+        text = strip_code_fences(text)
         try:
             return json.loads(text)
         except json.JSONDecodeError:
             pass
         # Find first {...}
-        for m in re.finditer(r'\{.*\}', text, re.DOTALL):
+        for m in _JSON_SPAN_RE.finditer(text):
             try:
                 return json.loads(m.group())
             except json.JSONDecodeError:
@@ -25,7 +25,8 @@ Execution guarantees enforced here
   1. get_page()        → ALWAYS returns a live Playwright Page
   2. ensure()         → Lightweight pre-action guard (idempotent)
   3. reset()          → Full teardown + cold restart on crash
-  4. Stale-error APIs → _is_stale_error() and STALE_BROWSER_ERRORS
+  4. Stale-error APIs → _is_stale_error(), _is_stale_error_str() and
+                        STALE_BROWSER_ERRORS
                         re-exported so callers need only one import
 """
 
@@ -41,6 +42,7 @@ from playwright.async_api import Page
 from .tools.browser_singleton import (
     BrowserSingleton as _CoreSingleton,
     _is_stale_error,
+    _is_stale_error_str,
     STALE_BROWSER_ERRORS,
 )
 
@@ -50,6 +52,7 @@ __all__ = [
     "BrowserSessionManager",
     "get_session",
     "_is_stale_error",
+    "_is_stale_error_str",
     "STALE_BROWSER_ERRORS",
 ]
 
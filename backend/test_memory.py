@@ -0,0 +1,145 @@
+"""
+Unit tests for LongTermMemory persistence and goal search.
+
+Covers the JSON-Lines store: supersede-on-reload, eviction at
+MAX_LONG_TERM_RECORDS, compaction, legacy .json migration and the
+trigram-backed search_by_goal. No browser or LLM is needed.
+
+Usage:
+    cd general-agent
+    python -m unittest backend.test_memory
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from . import memory
+from .memory import LongTermMemory, StepRecord, TaskRecord
+
+
+def _task(task_id: str, goal: str) -> TaskRecord:
+    return TaskRecord(
+        task_id=task_id,
+        session_id="session-1",
+        goal=goal,
+        mode="autonomous",
+        started_at="2026-01-01T00:00:00.000000Z",
+        steps=[
+            StepRecord(
+                step_number=1,
+                action="open_url",
+                parameters={"url": "https://example.com"},
+                result="ok",
+                success=True,
+                duration_ms=12,
+            )
+        ],
+    )
+
+
+class LongTermMemoryTests(unittest.TestCase):
+    """LongTermMemory against a file in a temporary directory."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "long_term.jsonl")
+
+    def tearDown(self):
+        # Release the shared append descriptor so the directory can be removed
+        fd = memory._APPEND_FDS.pop(self.path, None)
+        if fd is not None:
+            os.close(fd)
+        self._tmp.cleanup()
+
+    def _file_lines(self) -> int:
+        with open(self.path, "rb") as f:
+            return sum(1 for line in f if line.strip())
+
+    def test_later_line_supersedes_on_reload(self):
+        ltm = LongTermMemory(self.path)
+        ltm.store_task(_task("t1", "first goal"))
+        ltm.store_task(_task("t2", "other goal"))
+        ltm.store_task(_task("t1", "updated goal"))
+
+        reloaded = LongTermMemory(self.path)
+        self.assertEqual([r.task_id for r in reloaded.records], ["t2", "t1"])
+        self.assertEqual(reloaded.records[-1].goal, "updated goal")
+        self.assertEqual(reloaded.records[-1].steps[0].action, "open_url")
+        self.assertTrue(reloaded.records[-1].completed)
+
+    def test_evicts_oldest_past_the_cap(self):
+        with mock.patch.object(memory, "MAX_LONG_TERM_RECORDS", 3):
+            ltm = LongTermMemory(self.path)
+            for i in range(5):
+                ltm.store_task(_task(f"t{i}", f"goal {i}"))
+            self.assertEqual([r.task_id for r in ltm.records], ["t2", "t3", "t4"])
+
+            reloaded = LongTermMemory(self.path)
+            self.assertEqual([r.task_id for r in reloaded.records], ["t2", "t3", "t4"])
+
+    def test_compacts_when_lines_exceed_twice_the_records(self):
+        ltm = LongTermMemory(self.path)
+        ltm.store_task(_task("t1", "goal"))
+        ltm.store_task(_task("t1", "goal"))
+        # 2 lines for 1 live record: not over the 2x threshold yet
+        self.assertEqual(self._file_lines(), 2)
+
+        ltm.store_task(_task("t1", "goal"))
+        self.assertEqual(self._file_lines(), 1)
+
+        # Appends continue on the compacted file
+        ltm.store_task(_task("t2", "goal"))
+        self.assertEqual(self._file_lines(), 2)
+        self.assertEqual(
+            [r.task_id for r in LongTermMemory(self.path).records], ["t1", "t2"]
+        )
+
+    def test_migrates_legacy_json_file(self):
+        legacy = os.path.splitext(self.path)[0] + ".json"
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump([_task("t1", "old goal").to_dict(), _task("t2", "newer goal").to_dict()], f)
+
+        ltm = LongTermMemory(self.path)
+        self.assertEqual([r.task_id for r in ltm.records], ["t1", "t2"])
+        self.assertIsInstance(ltm.records[0].steps[0], StepRecord)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertEqual(self._file_lines(), 2)
+
+        reloaded = LongTermMemory(self.path)
+        self.assertEqual([r.goal for r in reloaded.records], ["old goal", "newer goal"])
+
+    def test_search_by_goal(self):
+        ltm = LongTermMemory(self.path)
+        ltm.store_task(_task("t1", "Find a free Python course"))
+        ltm.store_task(_task("t2", "Search Wikipedia for Go"))
+        ltm.store_task(_task("t3", "Book a flight"))
+
+        def ids(keyword):
+            return [r.task_id for r in ltm.search_by_goal(keyword)]
+
+        # Shorter than 3 chars: scanned without the trigram index
+        self.assertEqual(ids("go"), ["t2"])
+        self.assertEqual(ids("a"), ["t1", "t2", "t3"])
+        # 3+ chars: trigram candidates, confirmed by substring
+        self.assertEqual(ids("PYTHON"), ["t1"])
+        self.assertEqual(ids("free python"), ["t1"])
+        self.assertEqual(ids("for"), ["t2"])
+        self.assertEqual(ids("nohit"), [])
+
+        # The built index follows later stores, replacements and evictions
+        ltm.store_task(_task("t1", "Learn Rust"))
+        ltm.store_task(_task("t4", "Python tutorial"))
+        self.assertEqual(ids("python"), ["t4"])
+        self.assertEqual(ids("rust"), ["t1"])
+
+        # A reloaded store builds its index from the file
+        self.assertEqual(
+            [r.task_id for r in LongTermMemory(self.path).search_by_goal("python")], ["t4"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,7 +12,9 @@ Execution contract:
   automatically so callers always get a consistent structure.
 """
 
-from typing import Any, Callable, Dict, Optional
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from ..utils.logger import get_logger
 
@@ -68,14 +70,31 @@ class ToolRegistry:
       - Unknown tool → failure("Tool '...' not registered")
       - Exception in tool → failure("<ExceptionType>: <message>")
       - Non-compliant return → auto-normalised to success format
+      - Tools registered with the same ``resource`` never run concurrently
     """
 
     def __init__(self):
         self._tools: Dict[str, Callable] = {}
+        self._resource_locks: Dict[str, asyncio.Semaphore] = {}
+        # name → (callable, resource lock or None), resolved at registration
+        # so execute() needs a single lookup per call
+        self._entries: Dict[str, Tuple[Callable, Optional[asyncio.Semaphore]]] = {}
 
-    def register(self, name: str, fn: Callable) -> None:
-        """Register a tool function under a given name."""
+    def register(self, name: str, fn: Callable, resource: Optional[str] = None) -> None:
+        """
+        Register a tool function under a given name.
+
+        Args:
+            name:     Tool name
+            fn:       Async callable implementing the tool
+            resource: Optional stateful resource the tool drives (e.g. "browser");
+                      calls to tools sharing a resource are serialized
+        """
         self._tools[name] = fn
+        lock = None
+        if resource is not None:
+            lock = self._resource_locks.setdefault(resource, asyncio.Semaphore(1))
+        self._entries[name] = (fn, lock)
         logger.debug(f"[ToolRegistry] Registered tool: {name!r}")
 
     def get(self, name: str) -> Optional[Callable]:
@@ -98,17 +117,22 @@ class ToolRegistry:
             Always a dict: {"status": "success"|"error", "data": ..., "error": ...}
             Never raises.
         """
-        logger.info(f"[TOOL] Executing: {name} | params={parameters}")
+        logger.info("[TOOL] Executing: %s | params=%s", name, parameters)
 
-        fn = self._tools.get(name)
-        if fn is None:
+        entry = self._entries.get(name)
+        if entry is None:
             available = ", ".join(self.available()) or "(none registered)"
             result = failure(f"Tool '{name}' not registered. Available: {available}")
             logger.error(f"[TOOL RESULT] {result}")
             return result
 
+        fn, lock = entry
         try:
-            raw = await fn(**parameters)
+            if lock is None:
+                raw = await fn(**parameters)
+            else:
+                async with lock:
+                    raw = await fn(**parameters)
             result = _normalise(raw)
         except Exception as e:
             result = failure(f"{type(e).__name__}: {e}")
@@ -120,8 +144,9 @@ class ToolRegistry:
 
         # Log result at appropriate level
         if result["status"] == "success":
-            data_preview = str(result.get("data", ""))[:120]
-            logger.info(f"[TOOL RESULT] {name} → success | data={data_preview!r}")
+            if logger.isEnabledFor(logging.INFO):
+                data_preview = str(result.get("data", ""))[:120]
+                logger.info("[TOOL RESULT] %s → success | data=%r", name, data_preview)
         else:
             logger.warning(f"[TOOL RESULT] {name} → error | {result['error']}")
 
@@ -6,8 +6,10 @@ Design contract
 * `BrowserSingleton.get_page()` ALWAYS returns a live Playwright `Page`.
 * If any layer (browser / context / page) is missing or closed it is
   transparently recreated before the caller receives control.
-* `reset_browser()` performs a full teardown + cold restart — useful after
-  crash errors like "Target page, context or browser has been closed".
+* `reset_browser()` swaps in a prewarmed standby session (or performs a
+  full teardown + cold restart if none is ready) — useful after crash
+  errors like "Target page, context or browser has been closed".
+  Standby sessions are only kept when settings.BROWSER_STANDBY is on.
 * All state is protected by `asyncio.Lock` so concurrent tool calls are safe.
 
 Stale-error strings that trigger automatic recovery in the executor are
@@ -18,6 +20,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import re
 from typing import Optional
 
 from playwright.async_api import (
@@ -28,6 +31,8 @@ from playwright.async_api import (
     Playwright,
 )
 
+from ..config import settings
+
 logger = logging.getLogger(__name__)
 
 # ── error substrings that indicate a dead browser session ──────────────────
@@ -43,10 +48,20 @@ STALE_BROWSER_ERRORS: tuple[str, ...] = (
 )
 
 
+# Compiled once so error checks don't rescan the tuple per pattern
+_STALE_PATTERN = re.compile(
+    "|".join(re.escape(p) for p in STALE_BROWSER_ERRORS), re.IGNORECASE
+)
+
+
+def _is_stale_error_str(msg: str) -> bool:
+    """Return True when the error string *msg* signals a dead Playwright session."""
+    return _STALE_PATTERN.search(msg) is not None
+
+
 def _is_stale_error(exc: BaseException) -> bool:
     """Return True when *exc* signals a dead Playwright session."""
-    msg = str(exc).lower()
-    return any(pattern in msg for pattern in STALE_BROWSER_ERRORS)
+    return _is_stale_error_str(str(exc))
 
 
 class BrowserSingleton:
@@ -69,6 +84,10 @@ class BrowserSingleton:
         self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
         self._lock = asyncio.Lock()
+        # Prewarmed (playwright, browser, context, page) swapped in on reset
+        self._standby: Optional[tuple] = None
+        self._prewarm_task: Optional[asyncio.Task] = None
+        self._bg_tasks: set = set()
 
     # ── singleton accessor ────────────────────────────────────────────────
 
@@ -100,20 +119,47 @@ class BrowserSingleton:
 
     async def reset_browser(self) -> None:
         """
-        Forcefully tear down everything and perform a cold restart.
+        Replace the current session with a fresh one.
 
         Call this after catching a stale-browser error so the next
-        `get_page()` starts with a completely fresh session.
+        `get_page()` starts with a completely fresh session.  If a
+        prewarmed standby is ready it is swapped in immediately and the
+        old session is closed in the background; otherwise this falls
+        back to a full teardown + cold restart.  With
+        settings.BROWSER_STANDBY on, a new standby is then prewarmed for
+        the next reset.
         """
         async with self._lock:
-            logger.warning("[BrowserSingleton] Resetting browser (full teardown)...")
-            await self._teardown_unsafe()
-            await self._cold_start()
+            standby = self._take_standby()
+            if standby is not None:
+                logger.warning("[BrowserSingleton] Resetting browser (swapping in standby)...")
+                old = (self._playwright, self._browser, self._context, self._page)
+                self._playwright, self._browser, self._context, self._page = standby
+                self._spawn(self._close_session(old))
+            else:
+                logger.warning("[BrowserSingleton] Resetting browser (full teardown)...")
+                await self._teardown_unsafe()
+                await self._cold_start()
             logger.info("[BrowserSingleton] Browser successfully reset")
+        if settings.BROWSER_STANDBY:
+            self.prewarm_standby()
+
+    def prewarm_standby(self) -> None:
+        """Launch a standby session in the background unless one is ready or pending."""
+        if self._standby is not None:
+            return
+        if self._prewarm_task is not None and not self._prewarm_task.done():
+            return
+        self._prewarm_task = asyncio.get_running_loop().create_task(self._prewarm())
 
     async def stop(self) -> None:
         """Gracefully close the browser at server shutdown."""
         async with self._lock:
+            if self._prewarm_task is not None and not self._prewarm_task.done():
+                self._prewarm_task.cancel()
+            standby, self._standby = self._standby, None
+            if standby is not None:
+                await self._close_session(standby)
             await self._teardown_unsafe()
             logger.info("[BrowserSingleton] Browser stopped (server shutdown)")
 
@@ -176,11 +222,21 @@ class BrowserSingleton:
         Start Playwright, launch browser, create context + page.
         MUST be called while holding self._lock.
         """
-        self._playwright = await async_playwright().start()
+        (
+            self._playwright,
+            self._browser,
+            self._context,
+            self._page,
+        ) = await self._launch()
+        logger.info("[BrowserSingleton] Cold start complete — browser ready")
+
+    async def _launch(self) -> tuple:
+        """Start a new (playwright, browser, context, page) session without installing it."""
+        playwright = await async_playwright().start()
 
         # Try real Chrome first; fall back to bundled Chromium
         try:
-            self._browser = await self._playwright.chromium.launch(
+            browser = await playwright.chromium.launch(
                 channel="chrome",
                 headless=False,
                 args=["--start-maximized"],
@@ -191,13 +247,13 @@ class BrowserSingleton:
                 f"[BrowserSingleton] Real Chrome unavailable ({chrome_err}), "
                 "falling back to bundled Chromium"
             )
-            self._browser = await self._playwright.chromium.launch(
+            browser = await playwright.chromium.launch(
                 headless=False,
                 args=["--start-maximized"],
             )
             logger.info("[BrowserSingleton] Launched bundled Chromium (fallback)")
 
-        self._context = await self._browser.new_context(
+        context = await browser.new_context(
             viewport={"width": 1280, "height": 800},
             user_agent=(
                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -205,25 +261,59 @@ class BrowserSingleton:
                 "Chrome/121.0.0.0 Safari/537.36"
             ),
         )
-        self._page = await self._context.new_page()
-        logger.info("[BrowserSingleton] Cold start complete — browser ready")
+        page = await context.new_page()
+        return playwright, browser, context, page
 
-    async def _teardown_unsafe(self) -> None:
-        """
-        Best-effort teardown with NO lock (caller must hold the lock).
-        Swallows all errors so reset/stop never raises.
-        """
+    async def _prewarm(self) -> None:
+        """Background task: launch the standby session."""
+        try:
+            self._standby = await self._launch()
+            logger.info("[BrowserSingleton] Standby browser ready")
+        except Exception as exc:
+            logger.warning(f"[BrowserSingleton] Standby prewarm failed: {exc}")
+
+    def _take_standby(self) -> Optional[tuple]:
+        """Pop the standby session if it is still connected."""
+        standby, self._standby = self._standby, None
+        if standby is not None and not standby[1].is_connected():
+            self._spawn(self._close_session(standby))
+            return None
+        return standby
+
+    def _spawn(self, coro) -> None:
+        """Run *coro* in the background, keeping a reference until it finishes."""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+
+    @staticmethod
+    async def _close_session(session: tuple) -> None:
+        """Best-effort close of a (playwright, browser, context, page) tuple."""
+        playwright, browser, context, page = session
         for obj, name in [
-            (self._page, "page"),
-            (self._context, "context"),
-            (self._browser, "browser"),
-            (self._playwright, "playwright"),
+            (page, "page"),
+            (context, "context"),
+            (browser, "browser"),
         ]:
             if obj is not None:
                 try:
                     await obj.close()
                 except Exception as exc:
                     logger.debug(f"[BrowserSingleton] {name} close error (ignored): {exc}")
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception as exc:
+                logger.debug(f"[BrowserSingleton] playwright stop error (ignored): {exc}")
+
+    async def _teardown_unsafe(self) -> None:
+        """
+        Best-effort teardown with NO lock (caller must hold the lock).
+        Swallows all errors so reset/stop never raises.
+        """
+        await self._close_session(
+            (self._playwright, self._browser, self._context, self._page)
+        )
 
         self._page = None
         self._context = None
@@ -5,7 +5,7 @@ Provides:
   search_web(query)       — DuckDuckGo Lite search (no API key)
   extract_content(url)    — Fetch and extract readable text from any URL
 
-Uses httpx for HTTP and simple text extraction. BeautifulSoup is used
+Uses the shared httpx client (backend/_http.py) for HTTP and simple text extraction. BeautifulSoup is used
 if available; otherwise falls back to regex stripping.
 """
 
@@ -16,11 +16,12 @@ from typing import Optional
 
 import httpx
 
+from .. import _http
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# HTTP settings
+# HTTP settings (per request; the client itself is shared)
 _TIMEOUT = 20          # seconds
 _MAX_CONTENT = 5000    # chars returned to memory
 _USER_AGENT = (
@@ -28,6 +29,7 @@ _USER_AGENT = (
     "AppleWebKit/537.36 (KHTML, like Gecko) "
     "Chrome/121.0.0.0 Safari/537.36"
 )
+_HEADERS = {"User-Agent": _USER_AGENT}
 
 
 # ============================================================================
@@ -75,14 +77,11 @@ async def search_web(query: str, max_results: int = 8) -> str:
     url = f"https://duckduckgo.com/lite/?q={encoded}&kl=en-us"
 
     try:
-        async with httpx.AsyncClient(
-            timeout=_TIMEOUT,
-            headers={"User-Agent": _USER_AGENT},
-            follow_redirects=True,
-        ) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            html = resp.text
+        resp = await _http.get_async_client().get(
+            url, headers=_HEADERS, timeout=_TIMEOUT, follow_redirects=True
+        )
+        resp.raise_for_status()
+        html = resp.text
 
         # Parse result links from DuckDuckGo Lite HTML
         results = _parse_ddg_lite(html)
@@ -165,14 +164,11 @@ async def extract_content(url: str) -> str:
         url = "https://" + url
 
     try:
-        async with httpx.AsyncClient(
-            timeout=_TIMEOUT,
-            headers={"User-Agent": _USER_AGENT},
-            follow_redirects=True,
-        ) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            content_type = resp.headers.get("content-type", "")
+        resp = await _http.get_async_client().get(
+            url, headers=_HEADERS, timeout=_TIMEOUT, follow_redirects=True
+        )
+        resp.raise_for_status()
+        content_type = resp.headers.get("content-type", "")
 
         if "text/html" in content_type or not content_type:
             text = _strip_html(resp.text)
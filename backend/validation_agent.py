@@ -17,12 +17,12 @@ ValidationResult:
 """
 
 import json
-import re
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass, field
 
 from .system_prompt import VALIDATION_PROMPT_TEMPLATE
 from .llm_client import LLMClient
+from .planner import find_json_objects, strip_code_fences
 from .utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -162,7 +162,7 @@ class ValidationAgent:
     def _extract_json(self, text: str) -> Optional[dict]:
         """Extract first valid JSON object from a string."""
         # Remove markdown code fences if present
-        text = re.sub(r"```(?:json)?", "", text).strip()
+        text = strip_code_fences(text)
 
         # Try whole string first
         try:
@@ -171,10 +171,9 @@ class ValidationAgent:
             pass
 
         # Find first {...} block
-        pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-        for match in re.finditer(pattern, text, re.DOTALL):
+        for start, end in find_json_objects(text):
             try:
-                return json.loads(match.group())
+                return json.loads(text[start:end])
             except json.JSONDecodeError:
                 continue
         return None